@@ -0,0 +1,141 @@
+import difflib
+import os
+import re
+import threading
+
+import api_client
+from cache import TTLCache
+from jobs import JobPool
+
+ANSWER_CACHE_SIZE = 256
+# Answers are tied to an audit, so they only need to outlive it by a little
+ANSWER_CACHE_TTL = 3600
+# Parallel /ans calls allowed for pre-warming and batch questions
+ANSWER_WORKERS = 8
+# Cached answers are served only for the same normalized question unless COMPLYSMART_QA_NEAR_DUPLICATES=1
+# also allows reworded ones, which must use exactly the same words (in any order)
+NEAR_DUPLICATE_ANSWERS = os.environ.get("COMPLYSMART_QA_NEAR_DUPLICATES") == "1"
+# Minimum similarity ratio for a cached answer to be served for a reworded question
+NEAR_DUPLICATE_THRESHOLD = 0.9
+
+# Suggested questions on the Q&A page, pre-warmed into the answer cache after each audit
+SUGGESTED_QUESTIONS = [
+    "What are our biggest compliance risks?",
+    "How can we improve our KYC verification rate?",
+    "What regulatory changes should we prepare for?",
+    "How does our compliance compare to industry standards?",
+    "What immediate actions should we take to improve compliance?",
+    "What penalties might we face for our current compliance gaps?"
+]
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+# Function to normalize a question so trivial variations share a cache entry
+def normalize_question(question):
+    question = _PUNCTUATION.sub(" ", question.lower())
+    return _WHITESPACE.sub(" ", question).strip()
+
+
+def answer_key(question, audit_id):
+    return (audit_id, normalize_question(question))
+
+
+answer_cache = TTLCache(max_entries=ANSWER_CACHE_SIZE, ttl=ANSWER_CACHE_TTL)
+answer_jobs = JobPool(ANSWER_WORKERS, answer_cache, name="answer")
+
+
+# Function to look up a cached answer, optionally accepting a rewording of the question. Questions
+# that differ by a single word ("KYC" vs "AML") can be almost identical character by character,
+# so a rewording must use the same set of words to match.
+def lookup(question, audit_id, near_duplicates=NEAR_DUPLICATE_ANSWERS):
+    key = answer_key(question, audit_id)
+    answer = answer_cache.get(key)
+    if answer is not None or not near_duplicates:
+        return answer
+
+    normalized = key[1]
+    tokens = set(normalized.split())
+    matcher = difflib.SequenceMatcher(b=normalized, autojunk=False)
+    best_answer, best_ratio = None, NEAR_DUPLICATE_THRESHOLD
+    for (cached_audit, cached_question), cached_answer in answer_cache.items():
+        if cached_audit != audit_id or set(cached_question.split()) != tokens:
+            continue
+        matcher.set_seq1(cached_question)
+        if matcher.real_quick_ratio() < best_ratio or matcher.quick_ratio() < best_ratio:
+            continue
+        ratio = matcher.ratio()
+        if ratio >= best_ratio:
+            best_answer, best_ratio = cached_answer, ratio
+    return best_answer
+
+
+# Answer text as it streams in from the backend, readable by any number of sessions at once.
+# Readers get every chunk so far, then each new one as it arrives, until the stream ends.
+class SharedStream:
+    def __init__(self):
+        self._chunks = []
+        self._done = False
+        self._changed = threading.Condition()
+
+    # Function to copy a backend stream into the shared one (runs on the answer pool)
+    def feed(self, chunks):
+        try:
+            for chunk in chunks:
+                with self._changed:
+                    self._chunks.append(chunk)
+                    self._changed.notify_all()
+        finally:
+            with self._changed:
+                self._done = True
+                self._changed.notify_all()
+        return "".join(self._chunks)
+
+    def __iter__(self):
+        position = 0
+        while True:
+            with self._changed:
+                self._changed.wait_for(lambda: position < len(self._chunks) or self._done)
+                chunks = self._chunks[position:]
+                if not chunks:
+                    return
+            position += len(chunks)
+            yield "".join(chunks)
+
+
+_stream_lock = threading.Lock()
+
+
+def _fetch(question, stream):
+    return stream.feed(api_client.stream_answer(question))
+
+
+# Function to get an answer as a Future: completed if cached, shared if already being fetched,
+# otherwise streamed from the backend on the bounded answer pool. A running fetch exposes its
+# SharedStream as the Future's "stream" attribute.
+def submit(question, audit_id):
+    stream = SharedStream()
+    with _stream_lock:
+        future = answer_jobs.submit(answer_key(question, audit_id), _fetch, question, stream)
+        if not future.done() and not hasattr(future, "stream"):
+            future.stream = stream
+    return future
+
+
+# Function to stream an answer: cached answers come whole, and everyone asking a question that is
+# already being fetched (pre-warmed or asked by another session) follows that one request
+def stream(question, audit_id):
+    future = submit(question, audit_id)
+    shared = getattr(future, "stream", None)
+    if shared is not None:
+        yield from shared
+        future.result()
+    else:
+        yield future.result()
+
+
+# Function to fetch answers for the given questions in the background so later clicks hit the cache
+def prewarm(questions, audit_id):
+    for question in questions:
+        submit(question, audit_id)
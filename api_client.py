@@ -0,0 +1,183 @@
+import json
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import perf
+
+# API endpoint; set COMPLYSMART_API_URL to point the dashboard at another backend (e.g. mock_backend.py)
+API_URL = os.environ.get("COMPLYSMART_API_URL", "https://fingenius-ai-fastapi-0rad.onrender.com").rstrip("/")
+
+# (connect, read) timeouts in seconds per endpoint
+TIMEOUTS = {
+    "/query": (5, 120),
+    "/ans": (5, 60),
+}
+DEFAULT_TIMEOUT = (5, 30)
+
+# Connection pool shared by every session and worker thread
+POOL_SIZE = 16
+# Bounded retries with exponential backoff for connection errors and gateway failures. A request
+# that timed out or broke off after it was sent is not re-sent: the backend may already be running
+# it, and /query starts a new audit every time. A 504 means the gateway gave up waiting on a
+# request it had forwarded, so it is not retried either.
+MAX_RETRIES = 2
+RETRY_BACKOFF = 0.5
+RETRY_STATUSES = (502, 503)
+
+# Consecutive failures before the breaker opens, and seconds before a trial call is let through
+BREAKER_THRESHOLD = 5
+BREAKER_RESET_TIMEOUT = 30
+
+
+class BackendUnavailable(Exception):
+    pass
+
+
+# Fails fast once the backend has failed BREAKER_THRESHOLD times in a row, then lets a
+# single trial request through after BREAKER_RESET_TIMEOUT to probe for recovery.
+class CircuitBreaker:
+    def __init__(self, threshold=BREAKER_THRESHOLD, reset_timeout=BREAKER_RESET_TIMEOUT):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial_running:
+                raise BackendUnavailable("Compliance backend is unavailable, please try again shortly.")
+            self._trial_running = True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+            if self._opened_at is not None or self._failures >= self.threshold:
+                self._opened_at = time.monotonic()
+
+
+def _create_session():
+    retry = Retry(
+        total=MAX_RETRIES,
+        connect=MAX_RETRIES,
+        read=0,
+        status=MAX_RETRIES,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=None,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+session = _create_session()
+breaker = CircuitBreaker()
+
+
+# Function to POST to a backend endpoint through the shared pool and circuit breaker
+def post(endpoint, payload=None, **kwargs):
+    breaker.before_call()
+    try:
+        with perf.span(f"backend {endpoint}"):
+            response = session.post(
+                f"{API_URL}{endpoint}",
+                json=payload,
+                timeout=TIMEOUTS.get(endpoint, DEFAULT_TIMEOUT),
+                **kwargs,
+            )
+    except requests.RequestException:
+        breaker.record_failure()
+        raise
+
+    if response.status_code >= 500:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    try:
+        response.raise_for_status()
+    except requests.HTTPError:
+        # A streamed response would otherwise hold its pooled connection until it is garbage collected
+        response.close()
+        raise
+    return response
+
+
+# Function to run a new compliance audit. Concurrent runs are coalesced by the audit job pool.
+def run_audit():
+    return post("/query").json()
+
+
+# Function to stream an answer from the backend chunk by chunk. Server-sent events and
+# plain chunked text are yielded as they arrive; a regular JSON body is yielded whole.
+def stream_answer(question):
+    response = post(
+        "/ans",
+        {"q": question},
+        stream=True,
+        headers={"Accept": "text/event-stream, text/plain, application/json"},
+    )
+    with response:
+        content_type = response.headers.get("Content-Type", "")
+        if "charset" not in content_type:
+            response.encoding = "utf-8"
+
+        if content_type.startswith("application/json"):
+            yield response.json()["ans"]
+        elif content_type.startswith("text/event-stream"):
+            yield from _iter_sse(response)
+        else:
+            for chunk in response.iter_content(chunk_size=None, decode_unicode=True):
+                if chunk:
+                    yield chunk
+
+
+def _iter_sse(response):
+    data = []
+    for line in response.iter_lines(decode_unicode=True):
+        if line.startswith("data:"):
+            value = line[5:]
+            data.append(value[1:] if value.startswith(" ") else value)
+            continue
+        if line or not data:
+            continue
+
+        event, data = "\n".join(data), []
+        if event == "[DONE]":
+            return
+        yield _sse_text(event)
+
+    if data and data != ["[DONE]"]:
+        yield _sse_text("\n".join(data))
+
+
+# Events may carry bare text or a JSON object such as {"token": "..."} or {"ans": "..."}
+def _sse_text(event):
+    if not event.startswith("{"):
+        return event
+    try:
+        payload = json.loads(event)
+    except ValueError:
+        return event
+    for field in ("token", "delta", "text", "ans"):
+        if field in payload:
+            return payload[field]
+    return ""
@@ -0,0 +1,74 @@
+# Metric fields compared between audits; compliance_rate follows from them
+DIFF_FIELDS = ["actual", "target"]
+# Changes smaller than this (in percentage points) count as unchanged
+RATE_TOLERANCE = 0.05
+
+
+# Function to key a metric table's rows by category, each with a hash of its compared values
+def row_hashes(table):
+    values = zip(*(table[field].tolist() for field in DIFF_FIELDS))
+    return {category: hash(row) for category, row in zip(table["category"].tolist(), values)}
+
+
+# Function to compare two audits' metric tables. Rows are matched by category and compared by
+# hash, so only metrics whose values moved are looked at further. Regulator scores are carried
+# over from the previous audit's scorer and updated for the moved metrics alone.
+# Returns the delta and the scorer for the new audit.
+def diff_audits(old_table, new_table, old_scorer):
+    # A category listed twice in one audit is compared at its last value
+    old_rows = old_table.drop_duplicates("category", keep="last").set_index("category")
+    new_rows = new_table.drop_duplicates("category", keep="last").set_index("category")
+    old_hashes, new_hashes = row_hashes(old_table), row_hashes(new_table)
+
+    changed, added, removed, rates = [], [], [], {}
+    for category, digest in new_hashes.items():
+        previous = old_hashes.get(category)
+        if previous == digest:
+            continue
+        # The scorer takes every moved value, even one too small to be listed as a change
+        rates[category] = float(new_rows.at[category, "compliance_rate"])
+        if previous is None:
+            added.append(_metric(category, None, new_rows.loc[category]))
+        else:
+            entry = _metric(category, old_rows.loc[category], new_rows.loc[category])
+            if abs(entry["change"]) < RATE_TOLERANCE and entry["old_target"] == entry["new_target"]:
+                continue
+            changed.append(entry)
+    for category in old_hashes.keys() - new_hashes.keys():
+        removed.append(_metric(category, old_rows.loc[category], None))
+        rates[category] = None
+
+    scorer = old_scorer.copy()
+    old_scores = old_scorer.scores()
+    scorer.update(rates)
+    new_scores = scorer.scores()
+    regulators = {
+        name: (old_scores.get(name), new_scores.get(name))
+        for name in sorted(old_scores.keys() | new_scores.keys())
+        if old_scores.get(name) != new_scores.get(name)
+    }
+
+    changed.sort(key=lambda entry: entry["change"])
+    delta = {
+        "changed": changed,
+        "added": added,
+        "removed": sorted(removed, key=lambda entry: entry["category"]),
+        "regulators": regulators,
+        "unchanged": len(new_hashes) - len(changed) - len(added),
+    }
+    return delta, scorer
+
+
+def _metric(category, old, new):
+    entry = {"category": category}
+    for prefix, row in (("old", old), ("new", new)):
+        for field in DIFF_FIELDS + ["compliance_rate"]:
+            entry[f"{prefix}_{field}"] = None if row is None else float(row[field])
+    if old is not None and new is not None:
+        entry["change"] = entry["new_compliance_rate"] - entry["old_compliance_rate"]
+    return entry
+
+
+# Function to get {category: change in compliance rate} for the metrics that moved
+def rate_changes(delta):
+    return {entry["category"]: entry["change"] for entry in delta["changed"]}
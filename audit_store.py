@@ -0,0 +1,96 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+from cache import content_hash
+from history import history
+from metrics import CompactMetrics, audit_metric_table
+
+# Bytes of audit payloads kept in memory per process; set COMPLYSMART_AUDIT_BUDGET_MB to change it
+AUDIT_MEMORY_BUDGET = int(float(os.environ.get("COMPLYSMART_AUDIT_BUDGET_MB", "64")) * 1024 * 1024)
+
+
+class _AuditEntry:
+    __slots__ = ("audit", "metrics", "nbytes")
+
+    def __init__(self, audit, metrics):
+        self.audit = audit
+        self.metrics = metrics
+        self.nbytes = sum(sys.getsizeof(key) + sys.getsizeof(value) for key, value in audit.items()) + metrics.nbytes()
+
+
+# Process-wide, content-addressed store of audit payloads. Sessions keep only the audit's
+# content hash as a handle; the payload and its parsed metrics are held here once, however
+# many sessions view it. Cold audits are evicted least recently used first once the memory
+# budget is exceeded, and are reloaded from the audit history on their next use.
+class AuditStore:
+    def __init__(self, budget=AUDIT_MEMORY_BUDGET):
+        self.budget = budget
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    # Function to store an audit payload and return its handle
+    def put(self, audit_data, metric_table=None):
+        audit_id = content_hash(audit_data)
+        with self._lock:
+            if audit_id in self._entries:
+                self._entries.move_to_end(audit_id)
+                return audit_id
+        table = audit_metric_table(audit_data) if metric_table is None else metric_table
+        self._insert(audit_id, _AuditEntry(audit_data, CompactMetrics.from_table(table)))
+        return audit_id
+
+    def _insert(self, audit_id, entry):
+        with self._lock:
+            previous = self._entries.pop(audit_id, None)
+            if previous is not None:
+                self._nbytes -= previous.nbytes
+            self._entries[audit_id] = entry
+            self._nbytes += entry.nbytes
+            # The most recently used audit stays resident even if it alone exceeds the budget
+            while self._nbytes > self.budget and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._nbytes -= evicted.nbytes
+
+    def _entry(self, audit_id):
+        if audit_id is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(audit_id)
+            if entry is not None:
+                self._entries.move_to_end(audit_id)
+                return entry
+
+        audit_data, metric_rows = history.audit_by_hash(audit_id)
+        if audit_data is None:
+            return None
+        if metric_rows:
+            metrics = CompactMetrics(*zip(*metric_rows))
+        else:
+            metrics = CompactMetrics.from_table(audit_metric_table(audit_data))
+        entry = _AuditEntry(audit_data, metrics)
+        self._insert(audit_id, entry)
+        return entry
+
+    # Function to get an audit payload by handle, or None if it is neither resident nor recorded
+    def get(self, audit_id):
+        entry = self._entry(audit_id)
+        return None if entry is None else entry.audit
+
+    # Function to get an audit's parsed metrics as a fresh metric table
+    def metric_table(self, audit_id):
+        entry = self._entry(audit_id)
+        return None if entry is None else entry.metrics.to_table()
+
+    def __contains__(self, audit_id):
+        with self._lock:
+            return audit_id in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+audits = AuditStore()
@@ -0,0 +1,56 @@
+# Per-category chart cost against category count: the figure JSON sent to the browser and the
+# server time to build and serialize it, for the full SVG charts (every category drawn) and the
+# automatic mode in charts.py (WebGL traces with the worst categories kept and the rest
+# summarized above LARGE_CHART_CATEGORIES). Browser render time grows with the number of
+# SVG nodes, so the payload column is the proxy for it here.
+#
+#   python benchmarks/bench_charts.py --categories 10 100 1000 10000
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+
+def measure(build, scores, large, repeat):
+    from charts import _to_json
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        spec = _to_json(build(scores, large=large))
+        best = min(best, time.perf_counter() - start)
+    return best, len(spec)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chart payload and build time per category count")
+    parser.add_argument("--categories", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    import numpy as np
+
+    from charts import create_category_compliance_chart, create_radar_chart
+
+    rng = np.random.default_rng(0)
+    print(f"{'chart':>10} {'categories':>11} {'full KB':>9} {'full s':>8} {'auto KB':>9} {'auto s':>8}")
+    for count in args.categories:
+        actual = rng.uniform(20, 100, count).round(1)
+        scores = {
+            f"Control {i}": {"actual": float(a), "target": 100.0, "compliance_rate": float(a)}
+            for i, a in enumerate(actual)
+        }
+        for name, build in (("category", create_category_compliance_chart), ("radar", create_radar_chart)):
+            full_time, full_bytes = measure(build, scores, False, args.repeat)
+            auto_time, auto_bytes = measure(build, scores, None, args.repeat)
+            print(
+                f"{name:>10} {count:>11,} {full_bytes / 1024:>9.1f} {full_time:>7.3f}s"
+                f" {auto_bytes / 1024:>9.1f} {auto_time:>7.3f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
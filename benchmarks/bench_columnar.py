@@ -0,0 +1,73 @@
+# Loading a year of audit metrics: re-parsing the report text vs. the SQLite history vs.
+# Arrow IPC (memory-mapped) and Parquet files written by columnar.py.
+#
+#   python benchmarks/bench_columnar.py --days 365 --metrics 500 --entities 3
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+DAY = 24 * 60 * 60
+
+
+def timed(label, fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:>28} {best:>8.3f}s  {len(result):>10,} rows")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare ways of loading a year of parsed metrics")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--metrics", type=int, default=500, help="metrics per audit")
+    parser.add_argument("--entities", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.environ["COMPLYSMART_HISTORY_DB"] = os.path.join(workdir, "history.db")
+        import numpy as np
+
+        import columnar
+        from history import history
+        from metrics import extract_score_table, extract_score_tables
+
+        rng = np.random.default_rng(0)
+        categories = [f"Control {i} KYC" if i % 5 == 0 else f"Control {i}" for i in range(args.metrics)]
+        texts = []
+        start = time.perf_counter()
+        for day in range(args.days):
+            for entity in range(args.entities):
+                actual = rng.integers(30, 100, args.metrics)
+                text = "\n".join(f"{c}: {a}% → Standard: 100%" for c, a in zip(categories, actual))
+                texts.append(text)
+                history.record_audit(
+                    {"score": "Score: 70", "audit": text}, entity=f"Entity {entity}",
+                    created_at=day * DAY, metric_table=extract_score_table(text),
+                )
+        print(f"Seeded {len(texts):,} audits in {time.perf_counter() - start:.1f}s\n")
+
+        arrow_path = os.path.join(workdir, "metrics.arrow")
+        parquet_path = os.path.join(workdir, "metrics.parquet")
+        frame = columnar.metrics_frame()
+        columnar.write_metrics(frame, arrow_path, "arrow")
+        columnar.write_metrics(frame, parquet_path, "parquet")
+        for path in (arrow_path, parquet_path):
+            print(f"{os.path.basename(path):>28} {os.path.getsize(path) / 1e6:>8.1f} MB")
+        print()
+
+        timed("re-parse report text", lambda: extract_score_tables(texts)[0], repeat=1)
+        timed("SQLite history", lambda: history.metric_rows())
+        timed("Arrow IPC (memory-mapped)", lambda: columnar.load_metrics(arrow_path))
+        timed("Parquet", lambda: columnar.load_metrics(parquet_path))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# Benchmark metric extraction on multi-megabyte audit reports.
+#
+#   python benchmarks/bench_extract.py [--megabytes 1 4 16]
+#
+# Compares the original findall + per-row dict loop with metrics.extract_score_table
+# and the chunked MetricParser.
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from metrics import MetricParser, extract_score_table
+
+LEGACY_PATTERN = r'([^:]+):\s*(\d+(?:\.\d+)?)%\s*→\s*[^:]+:\s*(\d+(?:\.\d+)?)%'
+
+
+def legacy_extract_scores(text):
+    matches = re.findall(LEGACY_PATTERN, text)
+    scores = {}
+    for match in matches:
+        category = match[0].strip()
+        actual = float(match[1])
+        target = float(match[2])
+        scores[category] = {
+            'actual': actual,
+            'target': target,
+            'compliance_rate': (actual / target) * 100 if target > 0 else 0
+        }
+    return scores
+
+
+def make_report(megabytes, seed=0):
+    rng = random.Random(seed)
+    lines, size, i = [], 0, 0
+    while size < megabytes * 1024 * 1024:
+        target = rng.choice([75, 100, 100, 100, 0])
+        line = f"Entity {i // 50} Metric {i % 50}: {rng.uniform(0, 100):.1f}% → Standard: {target}%\n"
+        lines.append(line)
+        size += len(line.encode("utf-8"))
+        i += 1
+    return "".join(lines), i
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def parse_chunked(text, chunk_size=64 * 1024):
+    parser = MetricParser()
+    for start in range(0, len(text), chunk_size):
+        parser.feed(text[start:start + chunk_size])
+    return parser.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--megabytes", type=float, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'size':>8} {'lines':>9} {'legacy':>10} {'table':>10} {'chunked':>10} {'speedup':>8}")
+    for megabytes in args.megabytes:
+        text, lines = make_report(megabytes)
+        legacy = best_of(lambda: legacy_extract_scores(text), args.repeat)
+        table = best_of(lambda: extract_score_table.__wrapped__(text), args.repeat)
+        chunked = best_of(lambda: parse_chunked(text), args.repeat)
+        print(f"{megabytes:>6.1f}MB {lines:>9} {legacy:>9.3f}s {table:>9.3f}s {chunked:>9.3f}s {legacy / table:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# End-to-end latency/throughput benchmark: many simulated Streamlit sessions driving
+# main.py against the local mock backend.
+#
+#   python benchmarks/bench_sessions.py --sessions 40 --processes 4 --latency 0.5
+#
+# AppTest is not thread-safe, so concurrency comes from worker processes (like several
+# Streamlit server processes behind a load balancer). One audit is run against the mock
+# backend and recorded first, as the refresher or another user would; each process then keeps
+# its sessions open and steps them round-robin: open the dashboard on that audit, flip through
+# the dashboard tabs, open Q&A and ask a suggested question. Reports p50/p95/p99 rerun time,
+# backend call counts and memory per session.
+#
+# Sessions do not click "Run New Audit": AppTest replays a clicked button on every polling
+# rerun, which would start a new audit each time.
+import argparse
+import json
+import os
+import pickle
+import sys
+import tempfile
+import time
+import tracemalloc
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+TABS = ["By Regulatory Body", "Key Metrics", "History", "Overview"]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def session_steps(index):
+    from answer_cache import SUGGESTED_QUESTIONS
+
+    question = SUGGESTED_QUESTIONS[index % len(SUGGESTED_QUESTIONS)]
+    steps = [("open dashboard", lambda at: at.run())]
+    steps += [("switch tab", lambda at, tab=tab: at.radio(key="dashboard_tab").set_value(tab).run()) for tab in TABS]
+    steps += [
+        ("open Q&A", lambda at: at.sidebar.radio[0].set_value("Compliance Q&A").run()),
+        # Typed rather than clicked: AppTest replays a button's trigger on st.rerun()
+        ("suggested question", lambda at: at.text_input[0].input(question).run()),
+    ]
+    return steps
+
+
+def run_worker(session_ids, api_url, history_db, timeout):
+    os.environ["COMPLYSMART_API_URL"] = api_url
+    os.environ["COMPLYSMART_HISTORY_DB"] = history_db
+    from streamlit.testing.v1 import AppTest
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    sessions = [(index, AppTest.from_file(os.path.join(ROOT, "main.py"), default_timeout=timeout), session_steps(index))
+                for index in session_ids]
+
+    timings = {}
+    for step in range(len(sessions[0][2])):
+        for index, at, steps in sessions:
+            name, action = steps[step]
+            start = time.perf_counter()
+            action(at)
+            timings.setdefault(name, []).append(time.perf_counter() - start)
+            if at.exception:
+                raise RuntimeError(f"session {index} failed at {name}: {at.exception[0].message}")
+
+    traced = tracemalloc.get_traced_memory()[0] - baseline
+    state_sizes = [
+        len(pickle.dumps({key: at.session_state[key] for key in at.session_state.filtered_state}))
+        for _, at, _ in sessions
+    ]
+    return timings, traced, state_sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--answer-latency", type=float, default=0.5)
+    parser.add_argument("--report-kb", type=int, default=64)
+    parser.add_argument("--metrics", type=int, default=11)
+    parser.add_argument("--stream", action="store_true")
+    parser.add_argument("--timeout", type=float, default=60)
+    args = parser.parse_args()
+
+    from mock_backend import MockBackend, serve_in_background
+
+    backend = MockBackend(
+        latency=args.latency, answer_latency=args.answer_latency, report_kb=args.report_kb,
+        metrics=args.metrics, stream=args.stream,
+    )
+    server = serve_in_background(backend)
+    api_url = f"http://127.0.0.1:{server.server_address[1]}"
+    history_db = os.path.join(tempfile.mkdtemp(), "bench_history.db")
+    os.environ["COMPLYSMART_API_URL"] = api_url
+    os.environ["COMPLYSMART_HISTORY_DB"] = history_db
+    import api_client
+    from jobs import run_audit
+
+    run_audit()
+    # Forked workers would otherwise inherit this keep-alive connection and interleave requests on it
+    api_client.session.close()
+
+    processes = max(1, min(args.processes, args.sessions))
+    shards = [list(range(args.sessions))[i::processes] for i in range(processes)]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        results = list(pool.map(
+            run_worker, shards, [api_url] * processes, [history_db] * processes, [args.timeout] * processes
+        ))
+    wall = time.perf_counter() - start
+
+    with urllib.request.urlopen(f"{api_url}/stats") as response:
+        calls = json.load(response)
+    server.shutdown()
+
+    timings = {}
+    for worker_timings, _, _ in results:
+        for name, values in worker_timings.items():
+            timings.setdefault(name, []).extend(values)
+    every_run = [value for values in timings.values() for value in values]
+    traced = sum(result[1] for result in results)
+    state_sizes = [size for result in results for size in result[2]]
+
+    print(f"{args.sessions} sessions across {processes} processes, wall {wall:.2f}s, "
+          f"{len(every_run) / wall:.1f} reruns/s")
+    print(f"{'step':<20} {'runs':>5} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for name, values in list(timings.items()) + [("all reruns", every_run)]:
+        print(f"{name:<20} {len(values):>5} "
+              + " ".join(f"{percentile(values, pct) * 1000:>7.1f}ms" for pct in (50, 95, 99)))
+    print(f"backend calls: /query={calls['/query']} /ans={calls['/ans']}")
+    print(f"memory per session: {traced / args.sessions / 1024:.1f} KB traced (incl. shared caches), "
+          f"{sum(state_sizes) / len(state_sizes) / 1024:.1f} KB pickled session state")
+
+
+if __name__ == "__main__":
+    main()
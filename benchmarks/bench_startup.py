@@ -0,0 +1,89 @@
+# Cold-start benchmark: for each page, a fresh interpreter opens a session directly on that
+# page and reports the first run's time (module imports included), a rerun's time, the
+# element payload sent by each, and which heavy libraries the page ended up loading.
+#
+#   python benchmarks/bench_startup.py --repeat 3
+#   python benchmarks/bench_startup.py --root /path/to/other/checkout   # compare two trees
+#
+# The history database is seeded with one audit first, so the Dashboard has something to draw.
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+PAGES = ["Dashboard", "Portfolio", "Detailed Audit", "Compliance Q&A"]
+HEAVY_MODULES = ["numpy", "pandas", "plotly", "fpdf", "xlsxwriter"]
+
+SEED = """
+import sys
+sys.path.insert(0, sys.argv[1])
+from history import history
+from mock_backend import MockBackend
+history.record_audit(MockBackend(latency=0, answer_latency=0).audit())
+"""
+
+# Runs in a fresh interpreter; prints one JSON line with the measurements
+PROBE = """
+import json, sys, time
+root, page = sys.argv[1], sys.argv[2]
+sys.path.insert(0, root)
+from streamlit.testing.v1 import AppTest
+
+def payload(node):
+    proto = getattr(node, "proto", None)
+    size = proto.ByteSize() if proto is not None else 0
+    return size + sum(payload(child) for child in getattr(node, "children", {}).values())
+
+before = set(sys.modules)
+at = AppTest.from_file(root + "/main.py", default_timeout=120)
+at.session_state["page"] = page
+start = time.perf_counter()
+at.run()
+first = time.perf_counter() - start
+first_payload = payload(at._tree)
+start = time.perf_counter()
+at.run()
+rerun = time.perf_counter() - start
+loaded = sorted(name for name in %r if name in sys.modules and name not in before)
+print(json.dumps({"first": first, "rerun": rerun, "first_payload": first_payload,
+                  "rerun_payload": payload(at._tree), "loaded": loaded, "errors": len(at.exception)}))
+""" % (HEAVY_MODULES,)
+
+
+def run_probe(root, page, env):
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE, root, page], env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold start and rerun payload per page")
+    parser.add_argument("--root", default=ROOT, help="checkout of the app to measure")
+    parser.add_argument("--repeat", type=int, default=3, help="fresh interpreters per page")
+    args = parser.parse_args()
+    root = os.path.abspath(args.root)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        env = dict(os.environ, COMPLYSMART_HISTORY_DB=os.path.join(workdir, "history.db"))
+        env.pop("COMPLYSMART_REFRESH_SCHEDULE", None)
+        subprocess.run([sys.executable, "-c", SEED, root], env=env, check=True, capture_output=True)
+
+        print(f"{'page':>16} {'first run':>10} {'rerun':>8} {'first KB':>9} {'rerun KB':>9}  heavy modules loaded")
+        for page in PAGES:
+            runs = [run_probe(root, page, env) for _ in range(args.repeat)]
+            print(
+                f"{page:>16} {statistics.median(r['first'] for r in runs):>9.3f}s"
+                f" {statistics.median(r['rerun'] for r in runs):>7.3f}s"
+                f" {runs[0]['first_payload'] / 1024:>9.1f} {runs[0]['rerun_payload'] / 1024:>9.1f}"
+                f"  {', '.join(runs[0]['loaded']) or '-'}"
+                + ("  (errors)" if any(r['errors'] for r in runs) else "")
+            )
+
+
+if __name__ == "__main__":
+    main()
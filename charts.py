@@ -0,0 +1,328 @@
+import json
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io
+import streamlit as st
+
+from perf import timed
+
+# show_chart's fast path copies st.plotly_chart's private marshalling, which is only known to match
+# the Streamlit release pinned in requirements.txt; any other release uses the public API instead
+FAST_CHART_STREAMLIT = "1.32."
+try:
+    from streamlit.proto.PlotlyChart_pb2 import PlotlyChart as PlotlyChartProto
+except ImportError:
+    PlotlyChartProto = None
+_FAST_CHARTS = (
+    st.__version__.startswith(FAST_CHART_STREAMLIT)
+    and PlotlyChartProto is not None
+    and hasattr(st._main, "_enqueue")
+)
+
+# Distinct figures kept per builder; enough for every gauge, chart and audit a server sees in a day
+CHART_CACHE_ENTRIES = 256
+# Same config st.plotly_chart sends by default
+_CHART_CONFIG = json.dumps({"showLink": False, "linkText": False})
+# Above this many categories, per-category charts switch to WebGL traces with server-side
+# aggregation: the worst categories are drawn individually and the rest summarized
+LARGE_CHART_CATEGORIES = 60
+# Categories labeled individually in a large category chart
+LARGE_CHART_TOP_K = 30
+# Points kept for the full distribution curve of a large category chart
+LARGE_CHART_POINTS = 400
+# Axes on a large radar chart: the worst categories plus one for everything else
+RADAR_MAX_AXES = 12
+
+
+def _band_color(rate):
+    return '#FF4B4B' if rate < 50 else '#FFA500' if rate < 75 else '#00B050'
+
+def _is_large(scores_dict, large):
+    return len(scores_dict) > LARGE_CHART_CATEGORIES if large is None else large
+
+# Function to get the positions of the k lowest rates, lowest first, without sorting the rest
+def _worst(rates, k):
+    k = min(k, len(rates))
+    if k == 0:
+        return np.zeros(0, dtype=np.int64)
+    worst = np.argpartition(rates, k - 1)[:k] if k < len(rates) else np.arange(len(rates))
+    return worst[np.argsort(rates[worst], kind="stable")]
+
+
+# Function to create gauge chart
+@timed("create_gauge_chart")
+def create_gauge_chart(value, title):
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=value,
+        title={'text': title, 'font': {'size': 24}},
+        gauge={
+            'axis': {'range': [0, 100], 'tickwidth': 1, 'tickcolor': "darkblue"},
+            'bar': {'color': "darkblue"},
+            'bgcolor': "white",
+            'borderwidth': 2,
+            'bordercolor': "gray",
+            'steps': [
+                {'range': [0, 50], 'color': '#FF4B4B'},
+                {'range': [50, 75], 'color': '#FFA500'},
+                {'range': [75, 100], 'color': '#00B050'}
+            ],
+        }
+    ))
+    
+    fig.update_layout(
+        height=300,
+        margin=dict(l=30, r=30, t=30, b=30),
+        paper_bgcolor="white",
+        font={'color': "darkblue", 'family': "Arial"}
+    )
+    
+    return fig
+
+@timed("create_radar_chart")
+def create_radar_chart(scores_dict, large=None):
+    categories = list(scores_dict.keys())
+    actual_values = [scores_dict[cat]['actual'] for cat in categories]
+    target_values = [scores_dict[cat]['target'] for cat in categories]
+    title = 'Compliance Metrics Comparison'
+    scatter = go.Scatterpolar
+
+    # Hundreds of axes are unreadable: keep the worst categories and average the rest into one axis
+    if _is_large(scores_dict, large):
+        rates = np.array([scores_dict[cat]['compliance_rate'] for cat in categories], dtype=float)
+        worst = _worst(rates, RADAR_MAX_AXES - 1)
+        rest = np.ones(len(categories), dtype=bool)
+        rest[worst] = False
+        actual, target = np.array(actual_values, dtype=float), np.array(target_values, dtype=float)
+        categories = [categories[i] for i in worst]
+        actual_values, target_values = actual[worst].tolist(), target[worst].tolist()
+        if rest.any():
+            categories.append(f"Other ({int(rest.sum())} metrics, average)")
+            actual_values.append(float(actual[rest].mean()))
+            target_values.append(float(target[rest].mean()))
+        title = f'Compliance Metrics Comparison (worst {len(worst)} of {len(rates)})'
+        scatter = go.Scatterpolargl
+
+    fig = go.Figure()
+    
+    fig.add_trace(scatter(
+        r=actual_values,
+        theta=categories,
+        fill='toself',
+        name='Actual',
+        line_color='rgba(31, 119, 180, 0.8)',
+        fillcolor='rgba(31, 119, 180, 0.2)'
+    ))
+    
+    fig.add_trace(scatter(
+        r=target_values,
+        theta=categories,
+        fill='toself',
+        name='Target',
+        line_color='rgba(44, 160, 44, 0.8)',
+        fillcolor='rgba(44, 160, 44, 0.2)'
+    ))
+    
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, 100]
+            )),
+        showlegend=True,
+        title={
+            'text': title,
+            'x': 0.5,
+            'xanchor': 'center'
+        },
+        height=500
+    )
+    
+    return fig
+
+@timed("create_category_compliance_chart")
+def create_category_compliance_chart(scores_dict, large=None):
+    if _is_large(scores_dict, large):
+        return _create_large_category_chart(scores_dict)
+
+    categories = list(scores_dict.keys())
+    compliance_rates = [scores_dict[cat]['compliance_rate'] for cat in categories]
+    
+    colors = [_band_color(rate) for rate in compliance_rates]
+    
+    fig = px.bar(
+        x=categories,
+        y=compliance_rates,
+        labels={'x': 'Category', 'y': 'Compliance Rate (%)'},
+        title='Compliance Rate by Category'
+    )
+    
+    fig.update_traces(marker_color=colors)
+    
+    fig.update_layout(
+        xaxis={'categoryorder': 'total descending'},
+        yaxis={'range': [0, 100]},
+        height=400
+    )
+    
+    return fig
+
+# Large metric sets: every category's rate as one WebGL curve, worst first, downsampled to a fixed
+# number of points, with the worst categories overlaid as labeled markers
+def _create_large_category_chart(scores_dict):
+    categories = list(scores_dict.keys())
+    rates = np.array([scores_dict[cat]['compliance_rate'] for cat in categories], dtype=float)
+    order = np.argsort(rates, kind="stable")
+    ranks = np.unique(np.linspace(0, len(rates) - 1, min(len(rates), LARGE_CHART_POINTS)).round().astype(int))
+    worst = _worst(rates, LARGE_CHART_TOP_K)
+
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(
+        x=(ranks + 1).tolist(),
+        y=rates[order[ranks]].round(1).tolist(),
+        mode='lines',
+        name='All categories',
+        line_color='rgba(31, 119, 180, 0.8)',
+        hovertemplate='Rank %{x}: %{y}%<extra></extra>'
+    ))
+    fig.add_trace(go.Scattergl(
+        x=list(range(1, len(worst) + 1)),
+        y=rates[worst].round(1).tolist(),
+        mode='markers',
+        name=f'Worst {len(worst)}',
+        text=[categories[i] for i in worst],
+        marker_color=[_band_color(rate) for rate in rates[worst]],
+        hovertemplate='%{text}: %{y}%<extra></extra>'
+    ))
+
+    fig.update_layout(
+        title=f'Compliance Rate by Category ({len(rates):,} categories, worst first)',
+        xaxis={'title': 'Rank'},
+        yaxis={'title': 'Compliance Rate (%)', 'range': [0, 100]},
+        height=400
+    )
+
+    return fig
+
+@timed("create_regulator_chart")
+def create_regulator_chart(reg_bodies):
+    reg_df = pd.DataFrame({
+        "Regulatory Body": list(reg_bodies.keys()),
+        "Compliance Score": list(reg_bodies.values())
+    })
+    
+    fig = px.bar(
+        reg_df, 
+        x="Regulatory Body", 
+        y="Compliance Score",
+        color="Compliance Score",
+        color_continuous_scale=[(0, "red"), (0.5, "yellow"), (1, "green")],
+        range_color=[0, 100],
+        labels={"Compliance Score": "Score (%)"}
+    )
+    
+    fig.update_layout(title="Compliance by Regulatory Body")
+    
+    return fig
+
+@timed("create_distribution_chart")
+def create_distribution_chart(bin_starts, counts, title):
+    fig = go.Figure(go.Bar(
+        x=list(bin_starts),
+        y=list(counts),
+        offset=0,
+        width=100 / max(len(bin_starts), 1),
+        marker_color=[_band_color(start) for start in bin_starts]
+    ))
+    
+    fig.update_layout(
+        title=title,
+        xaxis={'title': 'Compliance Score (%)', 'range': [0, 100]},
+        yaxis={'title': 'Entities'},
+        bargap=0.05,
+        height=400
+    )
+    
+    return fig
+
+@timed("create_heatmap_chart")
+def create_heatmap_chart(rows, columns, values, title):
+    fig = go.Figure(go.Heatmap(
+        z=[list(row) for row in values],
+        x=list(columns),
+        y=list(rows),
+        zmin=0,
+        zmax=100,
+        colorscale=[(0, "red"), (0.5, "yellow"), (1, "green")],
+        colorbar={'title': 'Score (%)'}
+    ))
+    
+    fig.update_layout(title=title, height=400)
+    
+    return fig
+
+@timed("create_trend_chart")
+def create_trend_chart(timestamps, values, title):
+    fig = go.Figure(go.Scatter(
+        x=list(timestamps),
+        y=list(values),
+        mode='lines+markers',
+        line_color='rgba(31, 119, 180, 0.8)'
+    ))
+    
+    fig.update_layout(
+        title=title,
+        yaxis={'title': 'Compliance (%)', 'range': [0, 100]},
+        height=400
+    )
+    
+    return fig
+
+@timed("plotly serialize")
+def _to_json(fig):
+    return plotly.io.to_json(fig, validate=False)
+
+# Memoized builders: each distinct input is built and serialized to Plotly JSON once per
+# process, so reruns only pay for figures whose inputs actually changed.
+@st.cache_data(max_entries=CHART_CACHE_ENTRIES, show_spinner=False)
+def gauge_chart_spec(value, title):
+    return _to_json(create_gauge_chart(value, title))
+
+@st.cache_data(max_entries=CHART_CACHE_ENTRIES, show_spinner=False)
+def radar_chart_spec(scores_dict):
+    return _to_json(create_radar_chart(scores_dict))
+
+@st.cache_data(max_entries=CHART_CACHE_ENTRIES, show_spinner=False)
+def category_compliance_chart_spec(scores_dict):
+    return _to_json(create_category_compliance_chart(scores_dict))
+
+@st.cache_data(max_entries=CHART_CACHE_ENTRIES, show_spinner=False)
+def regulator_chart_spec(reg_bodies):
+    return _to_json(create_regulator_chart(reg_bodies))
+
+@st.cache_data(max_entries=CHART_CACHE_ENTRIES, show_spinner=False)
+def distribution_chart_spec(bin_starts, counts, title):
+    return _to_json(create_distribution_chart(bin_starts, counts, title))
+
+@st.cache_data(max_entries=CHART_CACHE_ENTRIES, show_spinner=False)
+def heatmap_chart_spec(rows, columns, values, title):
+    return _to_json(create_heatmap_chart(rows, columns, values, title))
+
+@st.cache_data(max_entries=CHART_CACHE_ENTRIES, show_spinner=False)
+def trend_chart_spec(timestamps, values, title):
+    return _to_json(create_trend_chart(timestamps, values, title))
+
+# Function to render a pre-serialized figure. This is what st.plotly_chart sends to the
+# browser, minus the per-rerun figure validation and JSON encoding.
+def show_chart(spec, use_container_width=True):
+    if not _FAST_CHARTS:
+        return st.plotly_chart(json.loads(spec), use_container_width=use_container_width)
+    proto = PlotlyChartProto()
+    proto.use_container_width = use_container_width
+    proto.figure.spec = spec
+    proto.figure.config = _CHART_CONFIG
+    proto.theme = "streamlit"
+    return st._main._enqueue("plotly_chart", proto)
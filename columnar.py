@@ -0,0 +1,105 @@
+# Columnar export and import of parsed compliance metrics for downstream analytics:
+#
+#   python columnar.py export metrics.parquet            # every recorded audit, all entities
+#   python columnar.py export metrics.arrow --entity Organization
+#   python columnar.py load metrics.arrow                # time a memory-mapped load
+#
+# Arrow IPC files are memory-mapped on load, so their columns are read straight from the page
+# cache without a copy; Parquet is the compressed interchange format. pyarrow is imported only
+# when a file is written or read.
+import argparse
+import os
+import time
+
+from history import history
+
+METRIC_FILE_COLUMNS = ["entity", "created_at", "category", "regulator", "actual", "target", "compliance_rate"]
+# File suffix per columnar format
+METRIC_FILE_FORMATS = {"arrow": ".arrow", "parquet": ".parquet"}
+# Categorical columns, stored as dictionary-encoded arrays
+DICTIONARY_COLUMNS = ["entity", "category", "regulator"]
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("pyarrow is required for Arrow/Parquet metric files (pip install pyarrow)") from e
+    return pyarrow
+
+
+# Function to get the recorded metrics as one frame in the metric file layout
+def metrics_frame(entity=None, since=None):
+    from regulators import assign_regulators
+
+    frame = assign_regulators(history.metric_rows(entity, since))
+    for column in DICTIONARY_COLUMNS:
+        frame[column] = frame[column].astype("category")
+    return frame[METRIC_FILE_COLUMNS]
+
+
+# Function to convert a metric frame to an Arrow table. Numeric columns without nulls are
+# wrapped rather than copied, and categoricals become dictionary arrays.
+def to_arrow(frame):
+    return _pyarrow().Table.from_pandas(frame, preserve_index=False)
+
+
+# Function to write a metric frame to a path or file object as Arrow IPC or Parquet
+def write_metrics(frame, destination, file_format="arrow"):
+    pa = _pyarrow()
+    table = to_arrow(frame)
+    if file_format == "parquet":
+        pa.parquet.write_table(table, destination)
+    elif file_format == "arrow":
+        with pa.ipc.new_file(destination, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        raise ValueError(f"Unknown metric file format: {file_format!r}")
+
+
+# Function to get a metric file's bytes for download
+def export_metrics(file_format="arrow", entity=None, since=None):
+    pa = _pyarrow()
+    sink = pa.BufferOutputStream()
+    write_metrics(metrics_frame(entity, since), sink, file_format)
+    return sink.getvalue().to_pybytes()
+
+
+# Function to load a metric file as a frame. Arrow IPC files are memory-mapped; Parquet
+# files are read through a memory map and decoded.
+def load_metrics(path):
+    pa = _pyarrow()
+    if path.lower().endswith(METRIC_FILE_FORMATS["parquet"]):
+        table = pa.parquet.read_table(path, memory_map=True)
+    else:
+        with pa.memory_map(path) as source:
+            table = pa.ipc.open_file(source).read_all()
+    return table.to_pandas(split_blocks=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export or load parsed compliance metrics as Arrow/Parquet")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="write recorded metrics to a file")
+    export.add_argument("path", help="output file (.arrow or .parquet)")
+    export.add_argument("--entity", help="only this entity's audits")
+    load = commands.add_parser("load", help="time loading a metric file")
+    load.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        file_format = "parquet" if args.path.lower().endswith(METRIC_FILE_FORMATS["parquet"]) else "arrow"
+        start = time.perf_counter()
+        frame = metrics_frame(args.entity)
+        write_metrics(frame, args.path, file_format)
+        print(f"Wrote {len(frame):,} metric rows to {args.path} in {time.perf_counter() - start:.2f}s")
+    else:
+        start = time.perf_counter()
+        frame = load_metrics(args.path)
+        elapsed = time.perf_counter() - start
+        print(f"Loaded {len(frame):,} metric rows ({os.path.getsize(args.path) / 1e6:.1f} MB) in {elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+import io
+import re
+from datetime import datetime
+
+from cache import TTLCache
+from jobs import JobPool
+from metrics import audit_metric_table, extract_overall_score
+
+# fpdf, xlsxwriter and the regulator tables are imported by the exporter that needs them,
+# since exports run on a worker long after the page importing this module has painted
+
+# Generated files are cached by audit hash, so repeat downloads are free
+EXPORT_CACHE_SIZE = 32
+EXPORT_CACHE_TTL = 3600
+EXPORT_WORKERS = 2
+
+# label, file name and MIME type per export format
+EXPORT_FORMATS = {
+    "pdf": ("Audit Report (PDF)", "compliance_audit_report.pdf", "application/pdf"),
+    "xlsx": (
+        "Audit Report (Excel)",
+        "compliance_audit_report.xlsx",
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ),
+}
+
+# The core PDF fonts only cover latin-1
+PDF_REPLACEMENTS = {
+    "→": "->", "←": "<-", "≤": "<=", "≥": ">=", "₹": "Rs. ", "•": "-", "–": "-", "—": "-",
+    "‘": "'", "’": "'", "“": '"', "”": '"', "…": "...", "✅": "[OK]", "❌": "[X]", "⚠️": "[!]", "⚠": "[!]",
+}
+_PDF_REPLACE_PATTERN = re.compile("|".join(re.escape(char) for char in PDF_REPLACEMENTS))
+_HTML_TAG = re.compile(r"<[^>]+>")
+_EMPHASIS = re.compile(r"(\*\*|__|\*|`)")
+_HEADING = re.compile(r"^(#{1,6})\s+(.*)")
+_BULLET = re.compile(r"^(\s*)[-*+]\s+(.*)")
+
+
+def _pdf_text(text):
+    text = _PDF_REPLACE_PATTERN.sub(lambda match: PDF_REPLACEMENTS[match.group(0)], text)
+    text = _EMPHASIS.sub("", _HTML_TAG.sub("", text))
+    return text.encode("latin-1", "replace").decode("latin-1")
+
+
+# Function to render the audit report markdown (headings, bullets, paragraphs) to PDF bytes
+def export_pdf(audit_data):
+    from fpdf import FPDF
+
+    pdf = FPDF()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_page()
+
+    pdf.set_font("Arial", "B", 18)
+    pdf.cell(0, 10, "Compliance Audit Report", ln=1, align="C")
+    pdf.set_font("Arial", "", 10)
+    pdf.cell(0, 6, f"Generated {datetime.now():%d %b %Y, %H:%M}", ln=1, align="C")
+    pdf.set_font("Arial", "B", 12)
+    pdf.cell(0, 10, f"Overall Compliance Score: {extract_overall_score(audit_data.get('score'))}", ln=1)
+    pdf.ln(2)
+
+    for line in (audit_data.get("audit") or "").splitlines():
+        heading = _HEADING.match(line)
+        bullet = _BULLET.match(line)
+        if heading:
+            pdf.ln(2)
+            pdf.set_font("Arial", "B", max(16 - 2 * len(heading.group(1)), 10))
+            pdf.multi_cell(0, 7, _pdf_text(heading.group(2)))
+        elif bullet:
+            indent = min(len(bullet.group(1)) // 2, 4) * 5
+            pdf.set_font("Arial", "", 10)
+            pdf.set_x(pdf.l_margin + 5 + indent)
+            pdf.multi_cell(0, 5, "- " + _pdf_text(bullet.group(2)))
+        elif line.strip():
+            pdf.set_font("Arial", "", 10)
+            pdf.multi_cell(0, 5, _pdf_text(line))
+        else:
+            pdf.ln(3)
+
+    return pdf.output(dest="S").encode("latin-1")
+
+
+# Function to write the audit to an Excel workbook. Rows are streamed in order through
+# XlsxWriter's constant-memory mode, so multi-entity metric tables never sit in memory twice.
+def export_excel(audit_data, metric_table=None):
+    import xlsxwriter
+
+    from regulators import assign_regulators
+
+    table = assign_regulators(audit_metric_table(audit_data) if metric_table is None else metric_table)
+    columns = [column for column in ("entity", "regulator", "category", "actual", "target", "compliance_rate") if column in table]
+
+    output = io.BytesIO()
+    workbook = xlsxwriter.Workbook(output, {"constant_memory": True})
+    bold = workbook.add_format({"bold": True})
+    percent = workbook.add_format({"num_format": "0.0"})
+
+    summary = workbook.add_worksheet("Summary")
+    summary.set_column(0, 0, 28)
+    summary.write_row(0, 0, ["Overall Compliance Score", extract_overall_score(audit_data.get("score"))], bold)
+    summary.write_row(1, 0, ["Metrics", len(table)])
+    summary.write_row(2, 0, ["Average Compliance Rate", float(table["compliance_rate"].mean()) if len(table) else 0], percent)
+    summary.write_row(3, 0, ["Generated", f"{datetime.now():%d %b %Y, %H:%M}"])
+
+    sheet = workbook.add_worksheet("Metrics")
+    sheet.set_column(0, len(columns) - 1, 22)
+    sheet.write_row(0, 0, [column.replace("_", " ").title() for column in columns], bold)
+    for row, values in enumerate(table[columns].itertuples(index=False, name=None), start=1):
+        sheet.write_row(row, 0, values)
+
+    report = workbook.add_worksheet("Report")
+    report.set_column(0, 0, 120)
+    for row, line in enumerate((audit_data.get("audit") or "").splitlines()):
+        report.write_string(row, 0, line)
+
+    workbook.close()
+    return output.getvalue()
+
+
+# Function to write a batch of questions and answers as one markdown document
+def export_answers(answers):
+    lines = ["# Compliance Q&A", "", f"Generated {datetime.now():%d %b %Y, %H:%M}", ""]
+    for number, (question, answer) in enumerate(answers, start=1):
+        lines += [f"## {number}. {question}", "", answer.strip() or "_No answer_", ""]
+    return "\n".join(lines).encode("utf-8")
+
+
+EXPORTERS = {"pdf": export_pdf, "xlsx": export_excel}
+
+export_cache = TTLCache(max_entries=EXPORT_CACHE_SIZE, ttl=EXPORT_CACHE_TTL)
+export_jobs = JobPool(EXPORT_WORKERS, export_cache, name="export")
+
+
+def cached_export(export_format, audit_id):
+    return export_jobs.cached((export_format, audit_id))
+
+
+# Function to generate an export on the export pool; identical requests share one job
+def submit_export(export_format, audit_id, audit_data):
+    return export_jobs.submit((export_format, audit_id), EXPORTERS[export_format], audit_data)
@@ -0,0 +1,241 @@
+import os
+import sqlite3
+import threading
+import time
+
+from cache import content_hash
+from metrics import audit_metric_table, extract_overall_score
+
+# SQLite file holding every recorded audit; set COMPLYSMART_HISTORY_DB to move it
+HISTORY_PATH = os.environ.get(
+    "COMPLYSMART_HISTORY_DB",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "audit_history.db"),
+)
+# Entity recorded for audits run from the sidebar
+DEFAULT_ENTITY = "Organization"
+# Bytes of the database file SQLite may memory-map for reads
+MMAP_SIZE = 256 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS audits (
+    id INTEGER PRIMARY KEY,
+    entity TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    audit_hash TEXT NOT NULL,
+    overall_score REAL,
+    score_text TEXT,
+    report TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_audits_entity_created ON audits (entity, created_at);
+CREATE INDEX IF NOT EXISTS idx_audits_entity_hash ON audits (entity, audit_hash, created_at);
+CREATE INDEX IF NOT EXISTS idx_audits_created ON audits (created_at);
+CREATE INDEX IF NOT EXISTS idx_audits_hash ON audits (audit_hash);
+
+CREATE TABLE IF NOT EXISTS metrics (
+    audit_id INTEGER NOT NULL REFERENCES audits (id) ON DELETE CASCADE,
+    entity TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    category TEXT NOT NULL,
+    actual REAL,
+    target REAL,
+    compliance_rate REAL
+);
+CREATE INDEX IF NOT EXISTS idx_metrics_entity_category_created ON metrics (entity, category, created_at);
+CREATE INDEX IF NOT EXISTS idx_metrics_category_created ON metrics (category, created_at);
+CREATE INDEX IF NOT EXISTS idx_metrics_audit ON metrics (audit_id);
+
+CREATE TABLE IF NOT EXISTS ingested_files (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    sha1 TEXT NOT NULL,
+    audit_hash TEXT
+);
+"""
+
+
+# Databases created before every run got its own row kept one row per (entity, content); the
+# audits table is rebuilt without that constraint, keeping ids so metric rows stay attached
+MIGRATE_UNIQUE_AUDITS = """
+PRAGMA foreign_keys=OFF;
+BEGIN;
+CREATE TABLE audits_new (
+    id INTEGER PRIMARY KEY,
+    entity TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    audit_hash TEXT NOT NULL,
+    overall_score REAL,
+    score_text TEXT,
+    report TEXT
+);
+INSERT INTO audits_new SELECT id, entity, created_at, audit_hash, overall_score, score_text, report FROM audits;
+DROP TABLE audits;
+ALTER TABLE audits_new RENAME TO audits;
+COMMIT;
+PRAGMA foreign_keys=ON;
+"""
+
+
+# Embedded audit history: every audit's score text, report and parsed metrics, indexed by
+# entity, timestamp and category. Each thread gets its own connection; WAL mode lets
+# readers run while an audit job is writing.
+class HistoryStore:
+    def __init__(self, path=HISTORY_PATH):
+        self.path = path
+        self._local = threading.local()
+        conn = self._connect()
+        row = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'audits'").fetchone()
+        if row is not None and "UNIQUE" in row[0]:
+            conn.executescript(MIGRATE_UNIQUE_AUDITS)
+        with conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+            self._local.conn = conn
+        return conn
+
+    # Function to record an audit and its parsed metrics. Every run is its own point in the history,
+    # even when its results match an earlier run's; ingestion skips files it has already read.
+    def record_audit(self, audit_data, entity=DEFAULT_ENTITY, created_at=None, metric_table=None):
+        created_at = time.time() if created_at is None else created_at
+        score_text = audit_data.get("score") or ""
+        table = audit_metric_table(audit_data) if metric_table is None else metric_table
+
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute(
+                "INSERT INTO audits (entity, created_at, audit_hash, overall_score, score_text, report) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (entity, created_at, content_hash(audit_data), extract_overall_score(score_text),
+                 score_text, audit_data.get("audit") or ""),
+            )
+            audit_id = cursor.lastrowid
+            conn.executemany(
+                "INSERT INTO metrics (audit_id, entity, created_at, category, actual, target, compliance_rate) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                zip(
+                    [audit_id] * len(table),
+                    [entity] * len(table),
+                    [created_at] * len(table),
+                    table["category"].tolist(),
+                    table["actual"].tolist(),
+                    table["target"].tolist(),
+                    table["compliance_rate"].tolist(),
+                ),
+            )
+        return audit_id
+
+    # Function to get the content hash and recording time of an entity's most recent audit,
+    # without reading its report
+    def latest_audit_id(self, entity=DEFAULT_ENTITY):
+        row = self._connect().execute(
+            "SELECT audit_hash, created_at FROM audits WHERE entity = ? ORDER BY created_at DESC LIMIT 1",
+            (entity,),
+        ).fetchone()
+        return (None, None) if row is None else (row[0], row[1])
+
+    # Function to get a number that changes whenever any entity records an audit, for caches
+    # built from the whole history
+    def version(self):
+        return self._connect().execute("SELECT MAX(id) FROM audits").fetchone()[0]
+
+    # Function to get when an entity last recorded the audit with the given content hash
+    def recorded_at(self, audit_hash, entity=DEFAULT_ENTITY):
+        return self._connect().execute(
+            "SELECT MAX(created_at) FROM audits WHERE entity = ? AND audit_hash = ?", (entity, audit_hash)
+        ).fetchone()[0]
+
+    # Function to get the content hash of the audit an entity recorded just before the latest run
+    # of the given one (the same hash when two runs in a row had the same results)
+    def previous_audit_id(self, audit_hash, entity=DEFAULT_ENTITY):
+        row = self._connect().execute(
+            "SELECT audit_hash FROM audits WHERE entity = ? AND created_at < "
+            "(SELECT MAX(created_at) FROM audits WHERE entity = ? AND audit_hash = ?) "
+            "ORDER BY created_at DESC LIMIT 1",
+            (entity, entity, audit_hash),
+        ).fetchone()
+        return None if row is None else row[0]
+
+    # Function to load a recorded audit by content hash, with its parsed metrics as
+    # (category, actual, target, compliance_rate) rows
+    def audit_by_hash(self, audit_hash):
+        row = self._connect().execute(
+            "SELECT id, score_text, report FROM audits WHERE audit_hash = ? ORDER BY created_at DESC LIMIT 1",
+            (audit_hash,),
+        ).fetchone()
+        if row is None:
+            return None, None
+        metric_rows = self._connect().execute(
+            "SELECT category, actual, target, compliance_rate FROM metrics WHERE audit_id = ? ORDER BY rowid",
+            (row[0],),
+        ).fetchall()
+        return {"score": row[1], "audit": row[2]}, metric_rows
+
+    # Function to get the overall score over time for an entity
+    def score_trend(self, entity=DEFAULT_ENTITY, since=None):
+        return self._query(
+            "SELECT created_at, overall_score FROM audits WHERE entity = ? AND created_at >= ? ORDER BY created_at",
+            (entity, since or 0),
+        )
+
+    # Function to get one metric (or every metric) over time for an entity
+    def metric_trend(self, category=None, entity=DEFAULT_ENTITY, since=None):
+        if category is None:
+            return self._query(
+                "SELECT created_at, category, actual, target, compliance_rate FROM metrics "
+                "WHERE entity = ? AND created_at >= ? ORDER BY created_at",
+                (entity, since or 0),
+            )
+        return self._query(
+            "SELECT created_at, category, actual, target, compliance_rate FROM metrics "
+            "WHERE entity = ? AND category = ? AND created_at >= ? ORDER BY created_at",
+            (entity, category, since or 0),
+        )
+
+    # Function to get every recorded metric row with its entity (all entities by default)
+    def metric_rows(self, entity=None, since=None):
+        if entity is None:
+            return self._query(
+                "SELECT entity, created_at, category, actual, target, compliance_rate FROM metrics "
+                "WHERE created_at >= ? ORDER BY created_at",
+                (since or 0,),
+            )
+        return self._query(
+            "SELECT entity, created_at, category, actual, target, compliance_rate FROM metrics "
+            "WHERE entity = ? AND created_at >= ? ORDER BY created_at",
+            (entity, since or 0),
+        )
+
+    def categories(self, entity=DEFAULT_ENTITY):
+        rows = self._connect().execute(
+            "SELECT DISTINCT category FROM metrics WHERE entity = ? ORDER BY category", (entity,)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    # Function to get the (mtime, size, sha1, audit_hash) recorded for each ingested file, by path
+    def ingested_files(self):
+        rows = self._connect().execute("SELECT path, mtime, size, sha1, audit_hash FROM ingested_files").fetchall()
+        return {row[0]: row[1:] for row in rows}
+
+    # Function to remember files as ingested, from (path, mtime, size, sha1, audit_hash) rows
+    def mark_ingested(self, rows):
+        conn = self._connect()
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO ingested_files VALUES (?, ?, ?, ?, ?)", rows)
+
+    def _query(self, sql, params):
+        import pandas as pd
+
+        frame = pd.read_sql_query(sql, self._connect(), params=params)
+        frame["created_at"] = pd.to_datetime(frame["created_at"], unit="s")
+        return frame
+
+
+history = HistoryStore()
@@ -0,0 +1,149 @@
+# Offline ingestion of audits that already exist on disk (exported reports, nightly batch output),
+# in place of the remote /query call:
+#
+#   python ingest.py reports/ --entity Organization
+#
+# Text and markdown files are hashed and decoded straight from a memory map, then parsed;
+# JSON files hold a /query-shaped result. Directories are parsed across cores in a process pool.
+# Files whose size and mtime are unchanged since the last run are skipped without being read,
+# and files that were only touched are recognized by their content hash.
+import argparse
+import hashlib
+import json
+import mmap
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from audit_store import audits
+from cache import TTLCache
+from history import history
+from jobs import JobPool
+from metrics import OVERALL_SCORE_PATTERN, audit_metric_text, extract_score_tables
+
+INGEST_SUFFIXES = (".md", ".markdown", ".txt", ".json")
+# File or directory the sidebar may ingest from; sidebar ingestion is off unless it is set
+INGEST_PATH = os.environ.get("COMPLYSMART_INGEST_PATH", "")
+# Parallel parser processes; smaller batches are parsed in-process
+INGEST_WORKERS = os.cpu_count() or 1
+PARALLEL_MIN_FILES = 8
+
+
+# Function to list the audit files under a path (or the path itself), sorted
+def audit_files(path):
+    path = os.path.abspath(path)
+    if os.path.isfile(path):
+        if not path.lower().endswith(INGEST_SUFFIXES):
+            raise ValueError(f"Not an audit file ({', '.join(INGEST_SUFFIXES)}): {path}")
+        return [path]
+    files = []
+    for root, _, names in os.walk(path):
+        files.extend(os.path.join(root, name) for name in names if name.lower().endswith(INGEST_SUFFIXES))
+    return sorted(files)
+
+
+# Function to read and parse one audit file (runs in a worker process). Returns the content hash,
+# and the audit and its metric table unless the hash matches the one already ingested.
+def read_audit_file(path, known_sha1=None):
+    with open(path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        try:
+            sha1 = hashlib.sha1(buffer).hexdigest()
+            if sha1 == known_sha1:
+                return sha1, None, None
+            # Decoded straight from the mapped pages, so the file is held in memory once, as text
+            text = str(buffer, "utf-8", "replace")
+        finally:
+            if size:
+                buffer.close()
+
+    # Parsed without the shared parse cache, which would otherwise keep large reports alive
+    if path.lower().endswith(".json"):
+        audit = json.loads(text)
+        return sha1, audit, extract_score_tables([audit_metric_text(audit)])[0]
+
+    score = OVERALL_SCORE_PATTERN.search(text)
+    audit = {"score": score.group(0) if score else "", "audit": text}
+    return sha1, audit, extract_score_tables([text])[0]
+
+
+# Function to ingest a file or directory of audits into the audit history and the audit store.
+# Audits are recorded at their file's mtime, under the given entity, the JSON "entity" field,
+# or the file name.
+def ingest_path(path, entity=None, workers=INGEST_WORKERS):
+    known = history.ingested_files()
+    files = audit_files(path)
+    changed = []
+    for file_path in files:
+        stat = os.stat(file_path)
+        previous = known.get(file_path)
+        if previous is None or previous[:2] != (stat.st_mtime, stat.st_size):
+            changed.append((file_path, stat))
+
+    paths = [file_path for file_path, _ in changed]
+    hashes = [(known.get(file_path) or (None,) * 4)[2] for file_path in paths]
+    if workers > 1 and len(changed) >= PARALLEL_MIN_FILES:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            results = list(executor.map(read_audit_file, paths, hashes, chunksize=max(1, len(paths) // (workers * 4))))
+    else:
+        results = list(map(read_audit_file, paths, hashes))
+
+    # "latest" holds each entity's most recent ingested audit as (audit_id, mtime)
+    summary = {"files": len(files), "ingested": 0, "unchanged": 0, "latest": {}}
+    manifest = []
+    for (file_path, stat), (sha1, audit, table) in zip(changed, results):
+        if audit is None:
+            summary["unchanged"] += 1
+            manifest.append((file_path, stat.st_mtime, stat.st_size, sha1, known[file_path][3]))
+            continue
+        audit_entity = entity or audit.get("entity") or os.path.splitext(os.path.basename(file_path))[0]
+        history.record_audit(audit, entity=audit_entity, created_at=stat.st_mtime, metric_table=table)
+        audit_id = audits.put(audit, table)
+        manifest.append((file_path, stat.st_mtime, stat.st_size, sha1, audit_id))
+        summary["ingested"] += 1
+        latest = summary["latest"].get(audit_entity)
+        if latest is None or stat.st_mtime > latest[1]:
+            summary["latest"][audit_entity] = (audit_id, stat.st_mtime)
+    history.mark_ingested(manifest)
+    return summary
+
+
+# Function to resolve a path given on the sidebar, relative to INGEST_PATH, rejecting anything
+# (including symlinks and "..") that leads outside it
+def ingest_root_path(path, root=INGEST_PATH):
+    if not root:
+        raise ValueError("Ingestion from the dashboard is disabled; set COMPLYSMART_INGEST_PATH")
+    root = os.path.realpath(root)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, resolved]) != root:
+        raise ValueError(f"Only files under {root} can be ingested")
+    return resolved
+
+
+def _ingest_under_root(path, entity):
+    return ingest_path(ingest_root_path(path), entity)
+
+
+# Ingestion from the sidebar runs in the background; a finished summary is kept briefly
+ingest_jobs = JobPool(1, TTLCache(max_entries=8, ttl=5), name="ingest")
+
+
+def submit_ingest(path, entity=None):
+    return ingest_jobs.submit((path, entity), _ingest_under_root, path, entity)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest audit reports from local files")
+    parser.add_argument("path", help="audit file or directory of audit files")
+    parser.add_argument("--entity", help="record every file under this entity instead of its file name")
+    parser.add_argument("--workers", type=int, default=INGEST_WORKERS, help="parser processes")
+    args = parser.parse_args()
+
+    summary = ingest_path(args.path, args.entity, args.workers)
+    print(f"Ingested {summary['ingested']} of {summary['files']} files ({summary['unchanged']} touched but unchanged)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import api_client
+from history import history
+
+# Bounded pool for backend work so a slow call never holds the Streamlit script thread
+AUDIT_WORKERS = 4
+
+
+# Runs keyed jobs on a shared worker pool. Identical keys submitted while a job is
+# in flight share the same Future. With a TTL cache, completed results are also kept
+# so every session asking for the same key within the TTL gets the stored result.
+class JobPool:
+    def __init__(self, max_workers, cache=None, name="job"):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._cache = cache
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key, fn, *args, **kwargs):
+        cached = self.cached(key)
+        if cached is not None:
+            future = Future()
+            future.set_result(cached)
+            return future
+
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._executor.submit(self._run, key, fn, *args, **kwargs)
+                self._inflight[key] = future
+        return future
+
+    def _run(self, key, fn, *args, **kwargs):
+        try:
+            result = fn(*args, **kwargs)
+            if self._cache is not None:
+                self._cache.set(key, result)
+            return result
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def cached(self, key):
+        return None if self._cache is None else self._cache.get(key)
+
+
+# Audit results are not cached here: a finished run is recorded in the audit history, which every
+# session follows, so asking for an audit always means a new run (or joining the one in flight)
+audit_jobs = JobPool(AUDIT_WORKERS, name="audit")
+
+
+# Function to run a new audit and record it in the audit history (runs on the audit pool)
+def run_audit():
+    audit_data = api_client.run_audit()
+    history.record_audit(audit_data)
+    return audit_data
+
+
+# Function to start a new audit, or join the run already in flight
+def submit_audit():
+    return audit_jobs.submit("audit", run_audit)
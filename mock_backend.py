@@ -0,0 +1,160 @@
+# Local stand-in for the compliance backend, for development and load testing without the network.
+#
+#   python mock_backend.py --port 8000 --latency 0.5 --report-kb 64
+#   COMPLYSMART_API_URL=http://localhost:8000 streamlit run main.py
+#
+# Implements POST /query and POST /ans with tunable latency and payload size, and
+# GET /stats with per-endpoint call counts.
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from metrics import SAMPLE_METRICS
+
+REPORT_SECTION = """
+## {title}
+
+- Finding {index}: controls reviewed against the applicable regulatory standard.
+- Evidence sampled across branches; exceptions noted in the compliance register.
+- Recommendation: tighten monitoring and re-test within the next audit cycle.
+"""
+
+
+class MockBackend:
+    def __init__(self, latency=0.5, answer_latency=0.5, jitter=0.1, report_kb=16, metrics=11,
+                 stream=False, tokens=40, seed=0):
+        self.latency = latency
+        self.answer_latency = answer_latency
+        self.jitter = jitter
+        self.report_kb = report_kb
+        self.metrics = metrics
+        self.stream = stream
+        self.tokens = tokens
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = {"/query": 0, "/ans": 0}
+
+    def _sleep(self, seconds):
+        time.sleep(max(0.0, seconds + self._random.uniform(-self.jitter, self.jitter) * seconds))
+
+    def _count(self, endpoint):
+        with self._lock:
+            self.calls[endpoint] += 1
+
+    def audit(self):
+        self._count("/query")
+        self._sleep(self.latency)
+        sample = [line for line in SAMPLE_METRICS.strip().splitlines()]
+        lines = [
+            sample[i] if i < len(sample) else f"Control Metric {i}: {self._random.randint(30, 100)}% → Standard: 100%"
+            for i in range(self.metrics)
+        ]
+        score = f"Compliance Score: {self._random.randint(40, 95)}\n" + "\n".join(lines)
+
+        sections, size, index = ["# Compliance Audit Report"], 0, 0
+        while size < self.report_kb * 1024:
+            section = REPORT_SECTION.format(title=f"Section {index + 1}", index=index + 1)
+            sections.append(section)
+            size += len(section)
+            index += 1
+        return {"score": score, "audit": "\n".join(sections)}
+
+    def answer_tokens(self, question):
+        self._count("/ans")
+        words = f"Answer to '{question}':".split() + ["compliance"] * self.tokens
+        return [word + " " for word in words]
+
+
+def make_handler(backend):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            if self.path == "/stats":
+                self._send_json(dict(backend.calls))
+            else:
+                self.send_error(404)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+            if self.path == "/query":
+                self._send_json(backend.audit())
+            elif self.path == "/ans":
+                self._answer(body.get("q", ""))
+            else:
+                self.send_error(404)
+
+        def _answer(self, question):
+            tokens = backend.answer_tokens(question)
+            if not (backend.stream and "text/event-stream" in self.headers.get("Accept", "")):
+                backend._sleep(backend.answer_latency)
+                self._send_json({"ans": "".join(tokens)})
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            delay = backend.answer_latency / max(len(tokens), 1)
+            for token in tokens + ["[DONE]"]:
+                backend._sleep(delay)
+                self._write_chunk(f"data: {token}\n\n".encode("utf-8"))
+            self.wfile.write(b"0\r\n\r\n")
+
+        def _write_chunk(self, data):
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.flush()
+
+        def _send_json(self, payload):
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+# Function to start the mock backend on a daemon thread; returns the server (port 0 picks a free port)
+def serve_in_background(backend, host="127.0.0.1", port=0):
+    server = ThreadingHTTPServer((host, port), make_handler(backend))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local mock of the compliance backend")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds per /query call")
+    parser.add_argument("--answer-latency", type=float, default=0.5, help="seconds per /ans call")
+    parser.add_argument("--jitter", type=float, default=0.1, help="relative latency jitter")
+    parser.add_argument("--report-kb", type=int, default=16, help="size of the audit report")
+    parser.add_argument("--metrics", type=int, default=11, help="metric lines in the score text")
+    parser.add_argument("--stream", action="store_true", help="stream /ans as server-sent events")
+    args = parser.parse_args()
+
+    backend = MockBackend(
+        latency=args.latency, answer_latency=args.answer_latency, jitter=args.jitter,
+        report_kb=args.report_kb, metrics=args.metrics, stream=args.stream,
+    )
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(backend))
+    server.daemon_threads = True
+    print(f"Mock backend listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
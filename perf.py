@@ -0,0 +1,129 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# Completed spans kept for the performance panel and exports
+RING_SIZE = 4096
+
+# Recording is process-wide, so it is a server setting (COMPLYSMART_PERF=1) rather than a
+# per-user switch; while off, every span and timed call is a single flag check.
+enabled = os.environ.get("COMPLYSMART_PERF") == "1"
+
+_spans = deque(maxlen=RING_SIZE)
+
+
+def clear():
+    _spans.clear()
+
+
+def _record(name, started_at, duration):
+    # deque.append is atomic, so worker threads can record without a lock
+    _spans.append((name, started_at, duration, threading.current_thread().name))
+
+
+class _Span:
+    __slots__ = ("name", "_start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        duration = time.perf_counter() - self._start
+        _record(self.name, time.time() - duration, duration)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+# Usage: with span("page Dashboard"): ...
+def span(name):
+    return _Span(name) if enabled else _NOOP
+
+
+# Decorator recording a span around every call of the function
+def timed(name):
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                duration = time.perf_counter() - start
+                _record(name, time.time() - duration, duration)
+        return wrapper
+    return decorate
+
+
+def spans():
+    return list(_spans)
+
+
+def _quantile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+# Function to summarize recorded spans per name: count, total, mean, p50, p95 and max seconds
+def summary():
+    durations = {}
+    for name, _, duration, _ in spans():
+        durations.setdefault(name, []).append(duration)
+
+    rows = []
+    for name, values in sorted(durations.items()):
+        values.sort()
+        rows.append({
+            "span": name,
+            "count": len(values),
+            "total": sum(values),
+            "mean": sum(values) / len(values),
+            "p50": _quantile(values, 0.5),
+            "p95": _quantile(values, 0.95),
+            "max": values[-1],
+        })
+    return rows
+
+
+def to_json():
+    return json.dumps({
+        "summary": summary(),
+        "spans": [
+            {"span": name, "started_at": started_at, "duration": duration, "thread": thread}
+            for name, started_at, duration, thread in spans()
+        ],
+    })
+
+
+# Function to export the span summary in the Prometheus text exposition format
+def to_prometheus():
+    lines = [
+        "# HELP complysmart_span_seconds Time spent in instrumented dashboard code paths.",
+        "# TYPE complysmart_span_seconds summary",
+    ]
+    for row in summary():
+        label = row["span"].replace("\\", "\\\\").replace('"', '\\"')
+        for quantile, key in (("0.5", "p50"), ("0.95", "p95")):
+            lines.append(f'complysmart_span_seconds{{span="{label}",quantile="{quantile}"}} {row[key]:.6f}')
+        lines.append(f'complysmart_span_seconds_sum{{span="{label}"}} {row["total"]:.6f}')
+        lines.append(f'complysmart_span_seconds_count{{span="{label}"}} {row["count"]}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,87 @@
+import json
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from metrics import audit_metric_text, extract_score_tables
+from regulators import assign_regulators
+
+# Bins used for the entity score distribution, whatever the number of entities
+DISTRIBUTION_BINS = 20
+# Entities listed in "lowest scoring" tables and drill-downs
+WORST_ENTITIES = 20
+
+SCORE_PATTERN = r'Score:\s*(\d+(?:\.\d+)?)'
+
+
+# Function to read a portfolio upload: a JSON array of audit results or JSON lines,
+# each with an "entity" name and the audit's "score"/"audit" text (or a "metrics" block)
+def load_audits(raw):
+    text = raw.decode("utf-8") if isinstance(raw, bytes) else raw
+    text = text.strip()
+    if text.startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+# Function to build the long, columnar metric frame for a portfolio of audits:
+# one row per (entity, metric) with its regulator
+def build_portfolio_frame(audits):
+    entities = [str(audit.get("entity") or f"Entity {i + 1}") for i, audit in enumerate(audits)]
+    frame, lengths = extract_score_tables([audit_metric_text(audit) for audit in audits])
+    frame.insert(0, "entity", np.repeat(np.array(entities, dtype=object), lengths))
+    frame = assign_regulators(frame)
+    for column in ("entity", "category", "regulator"):
+        frame[column] = frame[column].astype("category")
+
+    # An entity usually has several audits in one upload; its overall score is their average
+    overall = pd.Series([audit.get("score") or "" for audit in audits], index=entities, dtype=object)
+    overall = overall.str.extract(SCORE_PATTERN, expand=False).astype(float)
+    return frame, overall.groupby(level=0, sort=False).mean()
+
+
+# Function to precompute every aggregate the portfolio page and its drill-downs read
+def aggregate_portfolio(frame, overall):
+    rate = "compliance_rate"
+    # Entities whose audits had no parseable metrics are kept, with a count of 0
+    by_entity = frame.groupby("entity", observed=True)[rate].agg(["mean", "min", "count"])
+    by_entity = by_entity.reindex(overall.index.rename("entity"))
+    by_entity["count"] = by_entity["count"].fillna(0).astype(int)
+    by_entity["score"] = overall.fillna(by_entity["mean"]).to_numpy()
+    scored = by_entity["score"].dropna()
+
+    by_entity_regulator = (
+        frame.groupby(["regulator", "entity"], observed=True)[rate].mean()
+        .rename("compliance_rate").reset_index()
+        .sort_values(["regulator", "compliance_rate"])
+    )
+    heatmap = frame.pivot_table(
+        index="regulator", columns="category", values=rate, aggfunc="mean", observed=True
+    ).round(1)
+    counts, edges = np.histogram(scored.to_numpy(), bins=DISTRIBUTION_BINS, range=(0, 100))
+
+    return {
+        "entities": len(by_entity),
+        "metrics": len(frame),
+        "average_score": float(scored.mean()) if len(scored) else 0.0,
+        "below_50": int((scored < 50).sum()),
+        "by_entity": by_entity.sort_values("score"),
+        "by_regulator": frame.groupby("regulator", observed=True)[rate].mean().round(1),
+        "heatmap": (
+            tuple(heatmap.index.astype(str)),
+            tuple(heatmap.columns.astype(str)),
+            tuple(map(tuple, heatmap.astype(object).where(heatmap.notna(), None).to_numpy())),
+        ),
+        "by_entity_regulator": by_entity_regulator.set_index("regulator"),
+        "entity_metrics": frame.set_index("entity").sort_index(),
+        "distribution": (tuple(edges[:-1].tolist()), tuple(counts.tolist())),
+    }
+
+
+# Function to load and aggregate an uploaded portfolio once per distinct upload. Kept as a
+# shared resource (not copied per rerun), so treat the aggregates as read-only.
+@st.cache_resource(max_entries=8, show_spinner="Aggregating portfolio...")
+def load_portfolio(raw):
+    frame, overall = build_portfolio_frame(load_audits(raw))
+    return aggregate_portfolio(frame, overall)
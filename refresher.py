@@ -0,0 +1,156 @@
+# Scheduled audit refresh, so the first viewer of the day finds a completed audit instead of
+# waiting on the backend. Runs either inside the Streamlit server process:
+#
+#   COMPLYSMART_REFRESH_SCHEDULE="0 6 * * 1-5" streamlit run main.py
+#
+# or as a companion worker writing to the same audit history:
+#
+#   python refresher.py --schedule "*/30 * * * *" --jitter 120
+#
+# Schedules use the five cron fields (minute hour day month weekday, weekday 0 = Sunday)
+# with "*", "a-b", "*/n", "a-b/n" and comma-separated lists.
+import argparse
+import logging
+import os
+import random
+import threading
+from datetime import datetime, timedelta
+
+import answer_cache
+from answer_cache import SUGGESTED_QUESTIONS
+from audit_store import audits
+from jobs import submit_audit
+
+# Cron schedule for the in-process refresher; unset leaves it off
+REFRESH_SCHEDULE = os.environ.get("COMPLYSMART_REFRESH_SCHEDULE", "").strip()
+# Up to this many seconds are added to each run, so replicas do not all hit the backend at once
+REFRESH_JITTER = float(os.environ.get("COMPLYSMART_REFRESH_JITTER", "60"))
+
+CRON_FIELDS = [("minute", 0, 59), ("hour", 0, 23), ("day", 1, 31), ("month", 1, 12), ("weekday", 0, 6)]
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_field(field, name, low, high):
+    values = set()
+    for part in field.split(","):
+        span, _, step = part.partition("/")
+        step = int(step) if step else 1
+        if span == "*":
+            start, end = low, high
+        elif "-" in span:
+            start, end = (int(value) for value in span.split("-", 1))
+        else:
+            start = int(span)
+            end = high if step > 1 else start
+        if not low <= start <= end <= high or step < 1:
+            raise ValueError(f"Invalid {name} field in schedule: {field!r}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+class Schedule:
+    def __init__(self, spec):
+        fields = spec.split()
+        if len(fields) != len(CRON_FIELDS):
+            raise ValueError(f"Schedule needs {len(CRON_FIELDS)} fields, got {spec!r}")
+        self.spec = spec
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            _parse_field(field, *limits) for field, limits in zip(fields, CRON_FIELDS)
+        )
+        # As in cron, a restricted day and weekday match when either one does
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def _day_matches(self, moment):
+        day = moment.day in self.days
+        weekday = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day and weekday
+        return day or weekday
+
+    # Function to get the first matching minute strictly after the given time
+    def next_after(self, moment):
+        moment = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + timedelta(days=366 * 4)
+        while moment < limit:
+            if moment.month not in self.months:
+                moment = (moment.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(moment):
+                moment = moment.replace(hour=0, minute=0) + timedelta(days=1)
+            elif moment.hour not in self.hours:
+                moment = moment.replace(minute=0) + timedelta(hours=1)
+            elif moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+            else:
+                return moment
+        raise ValueError(f"Schedule {self.spec!r} never fires")
+
+
+# Function to run a new audit, record it and warm the shared caches
+def refresh_audit():
+    audit_id = audits.put(submit_audit().result())
+    answer_cache.prewarm(SUGGESTED_QUESTIONS, audit_id)
+    return audit_id
+
+
+# Daemon thread running refresh_audit on a schedule; a failed run is logged and retried at the next slot
+class AuditRefresher(threading.Thread):
+    def __init__(self, schedule, jitter=REFRESH_JITTER):
+        super().__init__(name="audit-refresher", daemon=True)
+        self.schedule = schedule if isinstance(schedule, Schedule) else Schedule(schedule)
+        self.jitter = jitter
+        self.next_run = None
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while True:
+            now = datetime.now()
+            self.next_run = self.schedule.next_after(now) + timedelta(seconds=random.uniform(0, self.jitter))
+            if self._stop_event.wait((self.next_run - now).total_seconds()):
+                return
+            try:
+                logger.info("Refreshed audit %s", refresh_audit())
+            except Exception:
+                logger.exception("Scheduled audit refresh failed")
+
+    def stop(self):
+        self._stop_event.set()
+
+
+_refresher = None
+_refresher_lock = threading.Lock()
+
+
+# Function to start the in-process refresher once per process when a schedule is configured
+def start_refresher(schedule=REFRESH_SCHEDULE, jitter=REFRESH_JITTER):
+    global _refresher
+    if not schedule:
+        return None
+    with _refresher_lock:
+        if _refresher is None:
+            _refresher = AuditRefresher(schedule, jitter)
+            _refresher.start()
+    return _refresher
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh compliance audits on a schedule")
+    parser.add_argument("--schedule", default=REFRESH_SCHEDULE or "0 * * * *", help="cron-style schedule")
+    parser.add_argument("--jitter", type=float, default=REFRESH_JITTER, help="max random delay in seconds")
+    parser.add_argument("--now", action="store_true", help="run one refresh immediately, then follow the schedule")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    refresher = AuditRefresher(args.schedule, args.jitter)
+    if args.now:
+        logger.info("Refreshed audit %s", refresh_audit())
+    refresher.start()
+    try:
+        refresher.join()
+    except KeyboardInterrupt:
+        refresher.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# Declarative mapping from metrics to regulators. Each rule matches category names
+# (case-insensitive regex) and contributes the metric to a regulator's score with the given
+# weight; a metric matched by several rules counts towards each of those regulators.
+REGULATOR_RULES = [
+    {"pattern": r"\bKYC\b", "regulator": "RBI", "weight": 1.0},
+    {"pattern": r"\bAML\b|Anti.Money", "regulator": "RBI", "weight": 1.0},
+    {"pattern": r"Credit Information", "regulator": "RBI", "weight": 1.0},
+    {"pattern": r"Loan.to.Value|\bLTV\b", "regulator": "RBI", "weight": 1.0},
+    {"pattern": r"\bNPA\b|Non.Performing", "regulator": "RBI", "weight": 1.0},
+    {"pattern": r"Capital Adequacy", "regulator": "RBI", "weight": 0.5},
+    {"pattern": r"\bAIF\b", "regulator": "SEBI", "weight": 1.0},
+    {"pattern": r"Financial Disclosure", "regulator": "SEBI", "weight": 1.0},
+    {"pattern": r"Investor", "regulator": "SEBI", "weight": 1.0},
+    {"pattern": r"Capital Adequacy", "regulator": "SEBI", "weight": 1.0},
+    {"pattern": r"\bTDS\b|Income Tax|Tax Payment", "regulator": "Income Tax", "weight": 1.0},
+    {"pattern": r"\bGST\b", "regulator": "GST", "weight": 1.0},
+]
+UNASSIGNED = "Other"
+# Compliance above target does not make up for gaps elsewhere
+MAX_RATE = 100.0
+
+
+def regulator_names(rules=REGULATOR_RULES):
+    return list(dict.fromkeys(rule["regulator"] for rule in rules))
+
+
+# Function to build the (metrics x regulators) weight matrix for a list of categories.
+# One vectorized regex match per rule, whatever the number of metrics.
+def rule_weights(categories, rules=REGULATOR_RULES):
+    regulators = regulator_names(rules)
+    column = {name: i for i, name in enumerate(regulators)}
+    categories = pd.Series(categories, dtype=object).astype(str)
+    weights = np.zeros((len(categories), len(regulators)))
+    for rule in rules:
+        matched = categories.str.contains(rule["pattern"], flags=re.IGNORECASE, regex=True).to_numpy()
+        weights[matched, column[rule["regulator"]]] += rule["weight"]
+    return weights, regulators
+
+
+# Function to add each metric's primary (highest-weight) regulator to a metric table
+def assign_regulators(table, rules=REGULATOR_RULES):
+    weights, regulators = rule_weights(table["category"], rules)
+    if not len(table):
+        return table.assign(regulator=np.array([], dtype=object))
+    names = np.array(regulators + [UNASSIGNED], dtype=object)
+    primary = np.where(weights.any(axis=1), weights.argmax(axis=1), len(regulators))
+    return table.assign(regulator=names[primary])
+
+
+# Weighted regulator scores over a metric table, kept incrementally. Scores are
+# sum(weight * rate) / sum(weight) per regulator; the sums are stored, so changing a few
+# metrics only touches the regulators those metrics map to.
+class RegulatorScorer:
+    def __init__(self, rules=REGULATOR_RULES):
+        self.rules = rules
+        self.regulators = regulator_names(rules)
+        self._rows = {}
+        self._weights = np.zeros((0, len(self.regulators)))
+        self._rates = np.zeros(0)
+        self._weighted_sum = np.zeros(len(self.regulators))
+        self._weight_total = np.zeros(len(self.regulators))
+
+    # Function to (re)compute every regulator score from a metric table in one pass. A category
+    # listed twice counts once, at its last value, as it does when audits are diffed.
+    def load(self, table):
+        table = table.drop_duplicates("category", keep="last")
+        categories = table["category"].tolist()
+        self._rows = {category: row for row, category in enumerate(categories)}
+        self._weights, _ = rule_weights(categories, self.rules)
+        self._rates = np.minimum(table["compliance_rate"].to_numpy(dtype=float), MAX_RATE)
+        self._weighted_sum = self._weights.T @ self._rates
+        self._weight_total = self._weights.sum(axis=0)
+        return self
+
+    # Function to get an independent scorer with the same state, to update without touching this one
+    def copy(self):
+        clone = RegulatorScorer(self.rules)
+        clone._rows = dict(self._rows)
+        clone._weights = self._weights.copy()
+        clone._rates = self._rates.copy()
+        clone._weighted_sum = self._weighted_sum.copy()
+        clone._weight_total = self._weight_total.copy()
+        return clone
+
+    # Function to apply changed, added or removed metric rates ({category: rate or None}).
+    # Returns the regulators whose scores changed.
+    def update(self, rates):
+        existing = [category for category in rates if category in self._rows]
+        added = [category for category in rates if category not in self._rows and rates[category] is not None]
+
+        affected = np.zeros(len(self.regulators), dtype=bool)
+        if existing:
+            rows = np.fromiter((self._rows[category] for category in existing), dtype=np.int64, count=len(existing))
+            new = np.array([rates[category] for category in existing], dtype=float)
+            removed = np.isnan(new)
+            new = np.minimum(np.where(removed, 0.0, new), MAX_RATE)
+            weights = self._weights[rows]
+
+            self._weighted_sum += weights.T @ (new - self._rates[rows])
+            self._weight_total -= weights[removed].sum(axis=0)
+            self._rates[rows] = new
+            self._weights[rows[removed]] = 0.0
+            for category in np.array(existing, dtype=object)[removed]:
+                del self._rows[category]
+            affected |= weights.any(axis=0)
+
+        if added:
+            weights, _ = rule_weights(added, self.rules)
+            new = np.minimum(np.array([rates[category] for category in added], dtype=float), MAX_RATE)
+            start = len(self._rates)
+            self._rows.update((category, start + i) for i, category in enumerate(added))
+            self._weights = np.vstack([self._weights, weights])
+            self._rates = np.concatenate([self._rates, new])
+            self._weighted_sum += weights.T @ new
+            self._weight_total += weights.sum(axis=0)
+            affected |= weights.any(axis=0)
+
+        return [name for name, hit in zip(self.regulators, affected) if hit]
+
+    # Function to get {regulator: score} for every regulator with at least one metric
+    def scores(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            scores = self._weighted_sum / self._weight_total
+        return {
+            name: round(float(score), 1)
+            for name, score, total in zip(self.regulators, scores, self._weight_total)
+            if total > 1e-9
+        }
+
+    # Function to get the metrics mapped to a regulator, worst compliance first
+    def metrics_for(self, regulator):
+        column = self.regulators.index(regulator)
+        categories = np.array(list(self._rows), dtype=object)
+        rows = np.fromiter(self._rows.values(), dtype=np.int64, count=len(self._rows))
+        mapped = self._weights[rows, column] > 0
+        order = np.argsort(self._rates[rows][mapped], kind="stable")
+        return categories[mapped][order].tolist()
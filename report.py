@@ -0,0 +1,78 @@
+import re
+from collections import Counter, defaultdict
+
+from perf import timed
+
+# Markdown ATX headings ("# Title" to "###### Title") start a new report section
+HEADING_PATTERN = re.compile(r'^(#{1,6})[ \t]+(.+?)[ \t#]*$', re.MULTILINE)
+TOKEN_PATTERN = re.compile(r'\w+')
+# Title for text that comes before the first heading
+PREAMBLE_TITLE = "Summary"
+# Search hits returned per query
+MAX_RESULTS = 20
+
+
+class Section:
+    __slots__ = ("title", "level", "body")
+
+    def __init__(self, title, level, body):
+        self.title = title
+        self.level = level
+        self.body = body
+
+
+def _tokens(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+# A long markdown report split into sections by heading, with a table of contents and an
+# inverted index from each word to the sections containing it (and how often)
+class ReportIndex:
+    def __init__(self, sections):
+        self.sections = sections
+        self._postings = defaultdict(dict)
+        for number, section in enumerate(sections):
+            for token, count in Counter(_tokens(section.title + "\n" + section.body)).items():
+                self._postings[token][number] = count
+
+        # Table of contents: numbered section titles, indented by heading level
+        top = min((section.level for section in sections), default=1)
+        self.toc = [
+            "\u2003" * max(section.level - top, 0) + f"{number + 1}. {section.title}"
+            for number, section in enumerate(sections)
+        ]
+        self._toc_positions = {entry: number for number, entry in enumerate(self.toc)}
+
+    # Function to get the section number of a table of contents entry, or None
+    def position(self, entry):
+        return self._toc_positions.get(entry)
+
+    # Function to find the sections containing every word of the query, most mentions first
+    def search(self, query, limit=MAX_RESULTS):
+        tokens = set(_tokens(query))
+        if not tokens:
+            return []
+        postings = sorted((self._postings.get(token, {}) for token in tokens), key=len)
+        hits = set(postings[0]).intersection(*postings[1:])
+        ranked = sorted(hits, key=lambda number: (-sum(p[number] for p in postings), number))
+        return ranked[:limit]
+
+    def __len__(self):
+        return len(self.sections)
+
+
+# Function to split a markdown report into sections at its headings and index their words
+@timed("split report")
+def index_report(report):
+    report = report or ""
+    sections = []
+    headings = list(HEADING_PATTERN.finditer(report))
+
+    preamble = report[:headings[0].start()] if headings else report
+    if preamble.strip():
+        sections.append(Section(PREAMBLE_TITLE, 1, preamble.strip("\n")))
+
+    for number, heading in enumerate(headings):
+        end = headings[number + 1].start() if number + 1 < len(headings) else len(report)
+        sections.append(Section(heading.group(2), len(heading.group(1)), report[heading.end():end].strip("\n")))
+    return ReportIndex(sections)
@@ -0,0 +1,106 @@
+import re
+
+import numpy as np
+
+# Risk bands matching the gauge steps: (name, lower bound, upper bound) on compliance rate
+RISK_BANDS = [("High", 0, 50), ("Medium", 50, 75), ("Low", 75, 100)]
+_BAND_EDGES = np.array([upper for _, _, upper in RISK_BANDS[:-1]], dtype=float)
+# Metrics materialized per band for the risk cards and recommendations
+TOP_N = 3
+# Rows per page when browsing the rest of a band
+PAGE_SIZE = 25
+
+# Suggested actions per metric, matched case-insensitively against the category name
+ACTION_TEMPLATES = [
+    (r"Large Investor", [
+        "Implement automated verification systems",
+        "Create dedicated team for large investor due diligence",
+        "Conduct quarterly verification audits",
+    ]),
+    (r"\bAIF\b|Due Diligence", [
+        "Update due diligence protocols to align with latest SEBI requirements",
+        "Implement regular training for staff on due diligence procedures",
+        "Create standardized due diligence checklist for all investors",
+    ]),
+    (r"Capital Adequacy", [
+        "Develop capital enhancement plan",
+        "Review asset weightings and risk classifications",
+        "Consider equity infusion to meet required threshold",
+    ]),
+    (r"\bKYC\b", [
+        "Streamline KYC process with digital verification",
+        "Implement automated reminders for incomplete KYC",
+        "Conduct monthly KYC compliance reviews",
+    ]),
+    (r"\bNPA\b|Non.Performing", [
+        "Enhance credit assessment procedures",
+        "Implement early warning system for potential defaults",
+        "Develop specialized recovery strategies for different asset classes",
+    ]),
+]
+DEFAULT_ACTIONS = [
+    "Assign an owner and a remediation deadline",
+    "Automate monitoring of this metric",
+    "Re-test controls in the next audit cycle",
+]
+_ACTION_PATTERNS = [(re.compile(pattern, re.IGNORECASE), actions) for pattern, actions in ACTION_TEMPLATES]
+
+
+def suggested_actions(category):
+    for pattern, actions in _ACTION_PATTERNS:
+        if pattern.search(category):
+            return actions
+    return DEFAULT_ACTIONS
+
+
+# Risk classification of a metric table. Metrics are banded by compliance rate and ranked by
+# gap to target; only the requested top slice of a band is ever sorted, using argpartition.
+class RiskReport:
+    def __init__(self, table):
+        self.table = table
+        rates = table["compliance_rate"].to_numpy(dtype=float)
+        self._gaps = 100.0 - np.minimum(rates, 100.0)
+        bands = np.digitize(rates, _BAND_EDGES)
+        self._members = {name: np.flatnonzero(bands == i) for i, (name, _, _) in enumerate(RISK_BANDS)}
+
+    def count(self, band):
+        return len(self._members[band])
+
+    def _ranked(self, band, k):
+        members = self._members[band]
+        k = min(k, len(members))
+        if k == 0:
+            return members[:0]
+        gaps = self._gaps[members]
+        if k < len(members):
+            top = np.argpartition(-gaps, k - 1)[:k]
+        else:
+            top = np.arange(len(members))
+        return members[top[np.argsort(-gaps[top], kind="stable")]]
+
+    # Function to get the n metrics of a band with the largest gap to target
+    def top(self, band, n=TOP_N):
+        return self.table.iloc[self._ranked(band, n)]
+
+    # Function to get one page of a band, ranked by gap to target
+    def page(self, band, page, page_size=PAGE_SIZE):
+        rows = self._ranked(band, (page + 1) * page_size)
+        return self.table.iloc[rows[page * page_size:]]
+
+    def pages(self, band, page_size=PAGE_SIZE):
+        return max(1, -(-self.count(band) // page_size))
+
+    # Function to build recommendation entries for the worst High and Medium risk metrics
+    def recommendations(self, n=TOP_N):
+        entries = []
+        for band, section in (("High", "Priority Actions"), ("Medium", "Secondary Actions")):
+            for row in self.top(band, n).itertuples(index=False):
+                entries.append({
+                    "section": section,
+                    "category": row.category,
+                    "entity": getattr(row, "entity", None),
+                    "actual": row.actual,
+                    "target": row.target,
+                    "actions": suggested_actions(row.category),
+                })
+        return entries
@@ -0,0 +1,52 @@
+import functools
+import json
+import os
+import re
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+# Stylesheet for the whole app, edited as plain CSS and minified once per process
+STYLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "style.css")
+STYLE_ELEMENT_ID = "complysmart-style"
+
+_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+_WHITESPACE = re.compile(r"\s+")
+_PUNCTUATION_SPACE = re.compile(r"\s*([{};,>])\s*")
+
+# Adds (or replaces) one <style> element in the app page itself. It outlives the zero-height
+# component frame that runs it, so the stylesheet stays applied on later reruns without
+# being sent again.
+INJECT_SCRIPT = """<script>
+const doc = window.parent.document;
+let style = doc.getElementById(%s);
+if (!style) {
+    style = doc.createElement("style");
+    style.id = %s;
+    doc.head.appendChild(style);
+}
+style.textContent = %s;
+</script>"""
+
+
+def minify_css(css):
+    css = _WHITESPACE.sub(" ", _COMMENT.sub("", css))
+    css = _PUNCTUATION_SPACE.sub(r"\1", css).replace(": ", ":")
+    return css.replace(";}", "}").strip()
+
+
+# Function to build the injection snippet for the stylesheet; built once per process
+@functools.lru_cache(maxsize=1)
+def style_bundle():
+    with open(STYLE_PATH, encoding="utf-8") as file:
+        css = minify_css(file.read())
+    element_id = json.dumps(STYLE_ELEMENT_ID)
+    return INJECT_SCRIPT % (element_id, element_id, json.dumps(css))
+
+
+# Function to apply the app stylesheet on a session's first run only
+def inject_css():
+    if st.session_state.get('css_injected'):
+        return
+    st.session_state['css_injected'] = True
+    components.html(style_bundle(), height=0)
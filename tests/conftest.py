@@ -0,0 +1,7 @@
+import os
+import sys
+import tempfile
+
+# The app's modules live at the repository root; the audit history goes to a scratch database
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("COMPLYSMART_HISTORY_DB", os.path.join(tempfile.mkdtemp(), "history.db"))
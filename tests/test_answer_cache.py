@@ -0,0 +1,65 @@
+import pytest
+
+import answer_cache
+from answer_cache import SUGGESTED_QUESTIONS, answer_key, lookup
+
+AUDIT = "audit"
+
+# Questions one word away from a suggested question, which must not get its answer
+NEAR_MISSES = [
+    ("How can we improve our KYC verification rate?", "How can we improve our AML verification rate?"),
+    ("How does our compliance compare to industry standards?", "How does our compliance compare to RBI standards?"),
+    ("What regulatory changes should we prepare for?", "What regulatory changes should we prepare for in 2026?"),
+]
+
+
+@pytest.fixture(autouse=True)
+def suggested_answers():
+    answer_cache.answer_cache.clear()
+    for question in SUGGESTED_QUESTIONS:
+        answer_cache.answer_cache.set(answer_key(question, AUDIT), f"answer to {question}")
+    yield
+    answer_cache.answer_cache.clear()
+
+
+def test_exact_match_after_normalization():
+    assert lookup("  how can we improve our KYC verification rate ", AUDIT) == f"answer to {SUGGESTED_QUESTIONS[1]}"
+
+
+def test_rewording_is_not_matched_by_default():
+    assert lookup("Our biggest compliance risks: what are they?", AUDIT) is None
+
+
+@pytest.mark.parametrize("cached, asked", NEAR_MISSES)
+@pytest.mark.parametrize("near_duplicates", [False, True])
+def test_question_with_different_words_is_not_matched(cached, asked, near_duplicates):
+    assert lookup(asked, AUDIT, near_duplicates=near_duplicates) is None
+
+
+def test_same_words_match_only_when_enabled():
+    asked = "What are our biggest compliance risks risks?"
+    assert lookup(asked, AUDIT) is None
+    assert lookup(asked, AUDIT, near_duplicates=True) == f"answer to {SUGGESTED_QUESTIONS[0]}"
+
+
+def test_answers_are_per_audit():
+    assert lookup(SUGGESTED_QUESTIONS[0], "another audit") is None
+
+
+def test_concurrent_askers_share_one_streamed_request(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    import api_client
+    from mock_backend import MockBackend, serve_in_background
+
+    backend = MockBackend(answer_latency=0.3, jitter=0, stream=True, tokens=10)
+    server = serve_in_background(backend)
+    monkeypatch.setattr(api_client, "API_URL", f"http://127.0.0.1:{server.server_address[1]}")
+    try:
+        with ThreadPoolExecutor(4) as pool:
+            answers = list(pool.map(lambda _: "".join(answer_cache.stream("Is KYC on track?", AUDIT)), range(4)))
+    finally:
+        server.shutdown()
+    assert backend.calls["/ans"] == 1
+    assert len(set(answers)) == 1 and answers[0]
+    assert lookup("Is KYC on track?", AUDIT) == answers[0]
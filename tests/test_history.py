@@ -0,0 +1,56 @@
+import sqlite3
+
+from cache import content_hash
+from history import HistoryStore
+
+A = {"score": "Score: 70", "audit": "KYC Verification Rate: 70% → Standard: 100%"}
+B = {"score": "Score: 80", "audit": "KYC Verification Rate: 80% → Standard: 100%"}
+
+
+def test_rerun_with_earlier_results_is_recorded(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.db"))
+    store.record_audit(A, created_at=100)
+    store.record_audit(B, created_at=200)
+    assert store.record_audit(A, created_at=300) is not None
+
+    audit_hash, created_at = store.latest_audit_id()
+    assert created_at == 300
+    assert store.recorded_at(audit_hash) == 300
+    assert audit_hash == content_hash(A)
+    assert store.previous_audit_id(audit_hash) == content_hash(B)
+    assert store.score_trend()["overall_score"].tolist() == [70, 80, 70]
+    assert store.metric_trend("KYC Verification Rate")["actual"].tolist() == [70, 80, 70]
+
+
+def test_database_with_unique_audits_is_migrated(tmp_path):
+    path = str(tmp_path / "history.db")
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE audits (
+            id INTEGER PRIMARY KEY, entity TEXT NOT NULL, created_at REAL NOT NULL, audit_hash TEXT NOT NULL,
+            overall_score REAL, score_text TEXT, report TEXT, UNIQUE (entity, audit_hash)
+        );
+        CREATE TABLE metrics (
+            audit_id INTEGER NOT NULL REFERENCES audits (id) ON DELETE CASCADE, entity TEXT NOT NULL,
+            created_at REAL NOT NULL, category TEXT NOT NULL, actual REAL, target REAL, compliance_rate REAL
+        );
+        INSERT INTO audits VALUES (1, 'Organization', 100, 'old', 60, 'Score: 60', '');
+        INSERT INTO metrics VALUES (1, 'Organization', 100, 'KYC Verification Rate', 60, 100, 60);
+    """)
+    conn.close()
+    store = HistoryStore(path)
+    store.record_audit(A, created_at=200)
+    store.record_audit(A, created_at=300)
+    assert store.score_trend()["overall_score"].tolist() == [60, 70, 70]
+    assert store.audit_by_hash("old")[1] == [("KYC Verification Rate", 60, 100, 60)]
+    assert len(store.metric_rows()) == 3
+
+
+def test_version_changes_for_every_entity(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.db"))
+    assert store.version() is None
+    store.record_audit(A, created_at=100)
+    version = store.version()
+    store.record_audit(B, entity="Branch A", created_at=50)
+    assert store.version() != version
+    assert store.latest_audit_id()[0] == content_hash(A)
@@ -0,0 +1,31 @@
+import os
+
+import pytest
+
+from ingest import audit_files, ingest_root_path
+
+
+def test_sidebar_paths_stay_under_the_ingest_root(tmp_path):
+    root = tmp_path / "audits"
+    (root / "2024").mkdir(parents=True)
+    (tmp_path / "secret.txt").write_text("not an audit")
+    os.symlink(tmp_path / "secret.txt", root / "link.txt")
+
+    assert ingest_root_path("2024", str(root)) == str(root / "2024")
+    assert ingest_root_path(str(root), str(root)) == str(root)
+    for path in ("..", "../secret.txt", "link.txt", "/etc/passwd", "/"):
+        with pytest.raises(ValueError):
+            ingest_root_path(path, str(root))
+    with pytest.raises(ValueError):
+        ingest_root_path(str(root), "")
+
+
+def test_single_files_must_be_audit_files(tmp_path):
+    report = tmp_path / "audit.md"
+    report.write_text("Compliance Score: 80")
+    (tmp_path / "notes.cfg").write_text("x")
+
+    assert audit_files(str(report)) == [str(report)]
+    assert audit_files(str(tmp_path)) == [str(report)]
+    with pytest.raises(ValueError):
+        audit_files(str(tmp_path / "notes.cfg"))
@@ -0,0 +1,27 @@
+import pytest
+
+from portfolio import aggregate_portfolio, build_portfolio_frame
+
+AUDITS = [
+    {"entity": "A", "score": "Score: 60", "audit": "KYC Verification Rate: 60% → Standard: 100%"},
+    {"entity": "A", "score": "Score: 80", "audit": "KYC Verification Rate: 80% → Standard: 100%"},
+    {"entity": "B", "score": "Score: 40", "audit": "AML Transaction Monitoring: 40% → Standard: 100%"},
+    {"entity": "C", "score": "Score: 90", "audit": "No metric lines in this report."},
+]
+
+
+def test_entity_with_several_audits_is_averaged():
+    portfolio = aggregate_portfolio(*build_portfolio_frame(AUDITS))
+    by_entity = portfolio["by_entity"]
+    assert by_entity.loc["A", "score"] == pytest.approx(70)
+    assert by_entity.loc["A", "count"] == 2
+    assert portfolio["below_50"] == 1
+
+
+def test_entity_without_metrics_is_counted():
+    portfolio = aggregate_portfolio(*build_portfolio_frame(AUDITS))
+    assert portfolio["entities"] == 3
+    assert portfolio["by_entity"].loc["C", "count"] == 0
+    assert portfolio["by_entity"].loc["C", "score"] == 90
+    assert portfolio["average_score"] == pytest.approx((70 + 40 + 90) / 3)
+    assert sum(portfolio["distribution"][1]) == 3
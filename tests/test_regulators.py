@@ -0,0 +1,59 @@
+import pandas as pd
+import pytest
+
+from audit_diff import diff_audits
+from regulators import RegulatorScorer
+
+
+def metric_table(rows):
+    table = pd.DataFrame(rows, columns=["category", "actual", "target"])
+    table["compliance_rate"] = table["actual"] * 100 / table["target"]
+    return table
+
+
+OLD = metric_table([
+    ("KYC Verification Rate", 72, 100),
+    ("AML Transaction Monitoring", 85, 100),
+    ("Capital Adequacy Ratio", 83, 100),
+    ("GST Filing Timeliness", 88, 100),
+    ("Large Investor Verification", 50, 100),
+])
+
+NEW = metric_table([
+    ("KYC Verification Rate", 90, 100),
+    ("AML Transaction Monitoring", 85, 100),
+    ("Capital Adequacy Ratio", 60, 100),
+    ("TDS Compliance Rate", 92, 100),
+    ("Large Investor Verification", 50, 100),
+    # Repeated category: the last value is the one that counts
+    ("KYC Verification Rate", 40, 100),
+])
+
+
+def test_repeated_category_counts_once_at_its_last_value():
+    scores = RegulatorScorer().load(NEW).scores()
+    assert scores == RegulatorScorer().load(NEW.drop_duplicates("category", keep="last")).scores()
+    assert scores["RBI"] == pytest.approx((40 + 85 + 0.5 * 60) / 2.5, abs=0.05)
+
+
+# Moves below the diff's reporting tolerance
+NUDGED = metric_table([
+    ("KYC Verification Rate", 72.04, 100),
+    ("AML Transaction Monitoring", 84.97, 100),
+    ("Capital Adequacy Ratio", 83, 100),
+    ("GST Filing Timeliness", 88.01, 100),
+    ("Large Investor Verification", 50, 100),
+])
+
+
+def test_moves_below_tolerance_are_not_listed():
+    delta, _ = diff_audits(OLD, NUDGED, RegulatorScorer().load(OLD))
+    assert delta["changed"] == [] and delta["unchanged"] == len(NUDGED)
+
+
+@pytest.mark.parametrize("old, new", [(OLD, NEW), (NEW, OLD), (pd.concat([OLD, OLD]), NEW), (OLD, NUDGED)])
+def test_incremental_update_matches_fresh_load(old, new):
+    _, scorer = diff_audits(old, new, RegulatorScorer().load(old))
+    assert scorer.scores() == RegulatorScorer().load(new).scores()
+    for regulator in scorer.scores():
+        assert scorer.metrics_for(regulator) == RegulatorScorer().load(new).metrics_for(regulator)
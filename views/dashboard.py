@@ -0,0 +1,361 @@
+import os
+
+import streamlit as st
+from datetime import datetime
+
+from charts import (
+    category_compliance_chart_spec,
+    gauge_chart_spec,
+    radar_chart_spec,
+    regulator_chart_spec,
+    show_chart,
+    trend_chart_spec,
+)
+from audit_diff import diff_audits, rate_changes
+from audit_store import audits
+from columnar import METRIC_FILE_FORMATS, export_metrics, load_metrics
+from history import history
+from jobs import submit_audit
+from metrics import SAMPLE_METRICS, extract_overall_score, extract_score_table, table_to_scores
+from regulators import RegulatorScorer
+from risk import PAGE_SIZE, RISK_BANDS, RiskReport
+
+# Dashboard views; only the selected one is built on each rerun
+TABS = ["Overview", "By Regulatory Body", "Key Metrics", "What Changed", "History"]
+# Findings listed per regulator, worst first
+KEY_FINDINGS = 4
+# Arrow or Parquet metric file offered for trends on the History tab
+METRICS_FILE = os.environ.get("COMPLYSMART_METRICS_FILE", "")
+
+
+# Regulator scores are computed once per audit and shared by every session viewing it
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _regulator_scorer(audit_id, _table):
+    return RegulatorScorer().load(_table)
+
+
+# A new audit is diffed against the one recorded before it, and its regulator scores are carried
+# forward from the previous audit's scorer, recomputing only the regulators whose metrics moved
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _audit_delta(audit_id, previous_id, _table):
+    previous_table = audits.metric_table(previous_id)
+    if previous_table is None:
+        return None, _regulator_scorer(audit_id, _table)
+    return diff_audits(previous_table, _table, _regulator_scorer(previous_id, previous_table))
+
+
+# Metric files for download are rebuilt only when any entity has recorded a new audit
+@st.cache_data(max_entries=4, show_spinner=False)
+def _metric_file_bytes(file_format, history_version):
+    return export_metrics(file_format)
+
+
+# Loaded metric files are memory-mapped once per file version and shared by every session
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _metric_file_frame(path, mtime):
+    return load_metrics(path)
+
+
+# Risk bands and recommendations are likewise classified once per audit
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _risk_report(audit_id, _table):
+    return RiskReport(_table)
+
+
+def render():
+    st.markdown("<div class='main-header'>Compliance Audit Dashboard</div>", unsafe_allow_html=True)
+
+    audit_id = st.session_state.get('audit_id')
+    audit_data = audits.get(audit_id)
+    if audit_data is None:
+        _render_placeholder()
+        return
+
+    # Extract the overall score and the metrics from the audit, and score each regulator from them
+    overall_score = extract_overall_score(audit_data['score'])
+    audit_table = table = audits.metric_table(audit_id)
+    sample = not len(table)
+    if sample:
+        # Nothing to chart from this audit, so show the reference metrics, labelled as such
+        table = extract_score_table(SAMPLE_METRICS)
+    # Sample scores are cached under their own key, never under the audit's
+    table_id = "sample" if sample else audit_id
+    scores = table_to_scores(table)
+    previous_id = history.previous_audit_id(audit_id)
+    if previous_id is None:
+        delta, scorer = None, _regulator_scorer(table_id, table)
+    elif sample:
+        # What changed is still this audit's own (empty) metrics against the previous audit's
+        delta, scorer = _audit_delta(audit_id, previous_id, audit_table)[0], _regulator_scorer(table_id, table)
+    else:
+        delta, scorer = _audit_delta(audit_id, previous_id, table)
+    risk = _risk_report(table_id, table)
+
+    # Display Overall Score
+    st.markdown("<div class='score-card'>", unsafe_allow_html=True)
+    st.markdown(f"<div class='score-value'>{overall_score}</div>", unsafe_allow_html=True)
+    st.markdown("<div class='score-label'>Overall Compliance Score</div>", unsafe_allow_html=True)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    # Audit age, with a refresh that runs in the background while this audit stays on screen
+    age_col, refresh_col = st.columns([4, 1])
+    with age_col:
+        if st.session_state.get('audit_recorded_at'):
+            recorded_at = datetime.fromtimestamp(st.session_state['audit_recorded_at'])
+            st.caption(f"Audit recorded {recorded_at:%d %b %Y, %H:%M} ({_age(recorded_at)})")
+    with refresh_col:
+        refreshing = 'audit_job' in st.session_state
+        st.button("Refreshing..." if refreshing else "Refresh", disabled=refreshing, on_click=_refresh)
+
+    if sample:
+        st.warning("This audit contains no metric lines. The charts and risk areas below show sample data, not your results.")
+
+    # Per-tab state instead of st.tabs, so switching views only builds the selected tab's charts
+    tab = st.radio("View", TABS, horizontal=True, key="dashboard_tab", label_visibility="collapsed")
+
+    if tab == "Overview":
+        _render_overview(overall_score, scores, scorer.scores())
+    elif tab == "By Regulatory Body":
+        _render_regulators(scores, scorer)
+    elif tab == "Key Metrics":
+        _render_key_metrics(scores, risk, rate_changes(delta) if delta else {})
+    elif tab == "What Changed":
+        _render_changes(delta)
+    else:
+        _render_history()
+        _render_metric_files()
+
+    st.markdown("<div class='sub-header'>Improvement Recommendations</div>", unsafe_allow_html=True)
+
+    with st.expander("View Recommendations", expanded=False):
+        _render_recommendations(risk)
+
+def _refresh():
+    st.session_state['audit_job'] = submit_audit()
+
+
+def _age(recorded_at):
+    minutes = int((datetime.now() - recorded_at).total_seconds() // 60)
+    if minutes < 1:
+        return "just now"
+    if minutes < 60:
+        return f"{minutes} min ago"
+    if minutes < 48 * 60:
+        return f"{minutes // 60} h ago"
+    return f"{minutes // (24 * 60)} days ago"
+
+
+def _render_placeholder():
+    # Display placeholder content
+    st.info("Run an audit to view your compliance dashboard. Click 'Run New Audit' in the sidebar to get started.")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("<div class='card'>", unsafe_allow_html=True)
+        st.subheader("Sample Compliance Metrics")
+        st.markdown("The dashboard will display key compliance metrics including:")
+        st.markdown("- Overall compliance score")
+        st.markdown("- Compliance by regulatory body")
+        st.markdown("- Key metrics and indicators")
+        st.markdown("- Areas needing improvement")
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    with col2:
+        st.markdown("<div class='card'>", unsafe_allow_html=True)
+        st.subheader("How It Works")
+        st.markdown("1. Click 'Run New Audit' to analyze your compliance data")
+        st.markdown("2. Review your compliance dashboard")
+        st.markdown("3. Explore detailed findings in the 'Detailed Audit' tab")
+        st.markdown("4. Ask questions about your compliance in the 'Compliance Q&A' tab")
+        st.markdown("</div>", unsafe_allow_html=True)
+
+
+def _render_overview(overall_score, scores, reg_scores):
+    col1, col2 = st.columns(2)
+
+    with col1:
+        show_chart(gauge_chart_spec(overall_score, "Overall Compliance"))
+
+    with col2:
+        show_chart(regulator_chart_spec(reg_scores))
+
+    # Display radar chart
+    show_chart(radar_chart_spec(scores))
+
+
+def _render_regulators(scores, scorer):
+    for regulator, score in scorer.scores().items():
+        st.markdown(f"<div class='sub-header'>{regulator} Compliance</div>", unsafe_allow_html=True)
+        gauge_col, findings_col = st.columns(2)
+
+        with gauge_col:
+            show_chart(gauge_chart_spec(score, f"{regulator} Compliance"))
+
+        with findings_col:
+            st.markdown("<div class='card'>", unsafe_allow_html=True)
+            st.markdown("### Key Findings")
+            for category in scorer.metrics_for(regulator)[:KEY_FINDINGS]:
+                st.markdown(f"- {_finding(category, scores[category])}")
+            st.markdown("</div>", unsafe_allow_html=True)
+
+
+def _finding(category, score):
+    comparison = f"({score['actual']:g}% vs {score['target']:g}%)"
+    if score['compliance_rate'] >= 100:
+        return f"{category} meets standard {comparison}"
+    if score['compliance_rate'] >= 75:
+        return f"{category} near standard {comparison}"
+    return f"{category} below standard {comparison}"
+
+
+def _render_key_metrics(scores, risk, changes):
+    show_chart(category_compliance_chart_spec(scores))
+
+    # Risk areas, worst gap to target first
+    st.markdown("<div class='sub-header'>Risk Areas</div>", unsafe_allow_html=True)
+    for (band, _, _), column in zip(RISK_BANDS, st.columns(len(RISK_BANDS))):
+        with column:
+            st.markdown("<div class='card'>", unsafe_allow_html=True)
+            st.markdown(f"### {band} Risk")
+            top = risk.top(band)
+            if top.empty:
+                st.markdown("- None")
+            for row in top.itertuples(index=False):
+                st.markdown(f"- {_metric_label(row)} ({row.compliance_rate:.0f}%){_change_marker(changes.get(row.category))}")
+            st.markdown("</div>", unsafe_allow_html=True)
+
+    # The rest of each band is only materialized one page at a time
+    for band, _, _ in RISK_BANDS:
+        if risk.count(band) <= len(risk.top(band)):
+            continue
+        with st.expander(f"All {band} Risk metrics ({risk.count(band)})"):
+            page = st.number_input("Page", min_value=1, max_value=risk.pages(band), key=f"risk_page_{band}")
+            st.dataframe(risk.page(band, page - 1, PAGE_SIZE), hide_index=True, use_container_width=True)
+
+
+def _change_marker(change):
+    if change is None:
+        return ""
+    return f" ▲ {change:+.0f} pts" if change > 0 else f" ▼ {change:+.0f} pts"
+
+
+def _metric_label(row):
+    entity = getattr(row, "entity", None)
+    return f"{entity}: {row.category}" if entity else row.category
+
+
+def _render_recommendations(risk):
+    recommendations = risk.recommendations()
+    if not recommendations:
+        st.markdown("No metrics are below the medium risk threshold.")
+        return
+
+    section = None
+    for number, entry in enumerate(recommendations, start=1):
+        if entry["section"] != section:
+            section = entry["section"]
+            st.markdown(f"### {section}")
+        label = f"{entry['entity']}: {entry['category']}" if entry["entity"] else entry["category"]
+        actions = "\n".join(f"   - {action}" for action in entry["actions"])
+        st.markdown(f"{number}. **Improve {label}** (Current: {entry['actual']:g}%, Target: {entry['target']:g}%)\n{actions}")
+
+def _render_changes(delta):
+    if delta is None:
+        st.info("This is the first recorded audit, so there is nothing to compare it with yet.")
+        return
+
+    changed_col, added_col, removed_col, unchanged_col = st.columns(4)
+    changed_col.metric("Changed", len(delta['changed']))
+    added_col.metric("Added", len(delta['added']))
+    removed_col.metric("Removed", len(delta['removed']))
+    unchanged_col.metric("Unchanged", delta['unchanged'])
+
+    if delta['regulators']:
+        st.markdown("<div class='sub-header'>Regulator Scores</div>", unsafe_allow_html=True)
+        for column, (regulator, (old, new)) in zip(st.columns(len(delta['regulators'])), delta['regulators'].items()):
+            if new is None:
+                column.metric(regulator, "n/a", "no metrics left", delta_color="off")
+            elif old is None:
+                column.metric(regulator, f"{new:.1f}", "new", delta_color="off")
+            else:
+                column.metric(regulator, f"{new:.1f}", f"{new - old:+.1f}")
+
+    for title, entries, columns in (
+        ("Changed Metrics", delta['changed'], ["category", "old_compliance_rate", "new_compliance_rate", "change"]),
+        ("Added Metrics", delta['added'], ["category", "new_actual", "new_target", "new_compliance_rate"]),
+        ("Removed Metrics", delta['removed'], ["category", "old_actual", "old_target", "old_compliance_rate"]),
+    ):
+        if entries:
+            st.markdown(f"<div class='sub-header'>{title}</div>", unsafe_allow_html=True)
+            st.dataframe(
+                [{column: entry[column] for column in columns} for entry in entries],
+                hide_index=True, use_container_width=True,
+            )
+
+    if not (delta['changed'] or delta['added'] or delta['removed']):
+        st.success("No metrics changed since the previous audit.")
+
+
+def _render_history():
+    # Trends come straight from the indexed audit history, without touching the backend
+    score_trend = history.score_trend()
+    if len(score_trend) < 2:
+        st.info("Run more audits to see how your compliance changes over time.")
+    else:
+        show_chart(trend_chart_spec(
+            tuple(score_trend['created_at'].dt.strftime('%Y-%m-%d %H:%M:%S')),
+            tuple(score_trend['overall_score'].tolist()),
+            "Overall Compliance Over Time"
+        ))
+
+        trend_category = st.selectbox("Metric", history.categories())
+        metric_trend = history.metric_trend(trend_category)
+        show_chart(trend_chart_spec(
+            tuple(metric_trend['created_at'].dt.strftime('%Y-%m-%d %H:%M:%S')),
+            tuple(metric_trend['compliance_rate'].round(1).tolist()),
+            f"{trend_category} Over Time"
+        ))
+
+
+def _render_metric_files():
+    # Columnar hand-off of every recorded metric for BI tools, and trends read back from such a file
+    with st.expander("Analytics Files (Arrow / Parquet)"):
+        file_format = st.radio("Format", list(METRIC_FILE_FORMATS), horizontal=True, key="metric_file_format")
+        if st.session_state.get('metric_export_ready') or st.button("Prepare Metrics Export"):
+            st.session_state['metric_export_ready'] = True
+            st.download_button(
+                label=f"Download Metrics ({file_format})",
+                data=_metric_file_bytes(file_format, history.version()),
+                file_name=f"compliance_metrics{METRIC_FILE_FORMATS[file_format]}",
+                mime="application/octet-stream",
+            )
+
+        path = st.text_input("Load trends from a metric file", value=METRICS_FILE, key="metrics_file")
+        if not path:
+            return
+        if not os.path.isfile(path):
+            st.warning(f"No metric file at {path}")
+            return
+        try:
+            frame = _metric_file_frame(path, os.path.getmtime(path))
+        except Exception as e:
+            st.error(f"Could not load the metric file: {str(e)}")
+            return
+
+        st.caption(f"{len(frame):,} metric rows from {frame['entity'].nunique():,} entities")
+        entity = st.selectbox("Entity", sorted(frame['entity'].unique()), key="metrics_file_entity")
+        rows = frame[frame['entity'] == entity]
+        average = rows.groupby('created_at', observed=True)['compliance_rate'].mean().round(1)
+        show_chart(trend_chart_spec(
+            tuple(average.index.strftime('%Y-%m-%d %H:%M:%S')),
+            tuple(average.tolist()),
+            f"{entity}: Average Compliance Over Time"
+        ))
+
+        category = st.selectbox("Metric", sorted(rows['category'].unique()), key="metrics_file_category")
+        metric_trend = rows[rows['category'] == category]
+        show_chart(trend_chart_spec(
+            tuple(metric_trend['created_at'].dt.strftime('%Y-%m-%d %H:%M:%S')),
+            tuple(metric_trend['compliance_rate'].round(1).tolist()),
+            f"{entity}: {category} Over Time"
+        ))
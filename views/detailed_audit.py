@@ -0,0 +1,92 @@
+import streamlit as st
+
+from audit_store import audits
+from exporters import EXPORT_FORMATS, cached_export, submit_export
+from report import index_report
+
+# Report sections shown at once; each one's body is only sent when it is opened
+SECTIONS_PER_PAGE = 5
+
+
+# Sections, table of contents and search index are built once per report
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _report_index(audit_id, _report):
+    return index_report(_report)
+
+
+def _jump_to(entry):
+    st.session_state['report_section'] = entry
+
+
+# Returns True while an export job is running, so main.py keeps polling
+def render():
+    st.markdown("<div class='main-header'>Detailed Compliance Audit Report</div>", unsafe_allow_html=True)
+
+    audit_id = st.session_state.get('audit_id')
+    audit_data = audits.get(audit_id)
+    if audit_data is None:
+        st.info("No audit data available. Please run an audit from the Dashboard.")
+        return False
+
+    _render_report(_report_index(audit_id, audit_data['audit']))
+
+    # Exports are generated on a worker thread only when requested, then cached per audit
+    poll_jobs = False
+    export_cols = st.columns(len(EXPORT_FORMATS))
+    for col, (export_format, (label, file_name, mime)) in zip(export_cols, EXPORT_FORMATS.items()):
+        with col:
+            job_key = f'export_job_{export_format}'
+            export_job = st.session_state.get(job_key)
+            if export_job is not None and export_job.done():
+                del st.session_state[job_key]
+                if export_job.exception() is not None:
+                    st.error(f"Could not generate the {label}: {export_job.exception()}")
+                export_job = None
+
+            artifact = cached_export(export_format, audit_id)
+            if artifact is not None:
+                st.download_button(
+                    label=f"Download {label}",
+                    data=artifact,
+                    file_name=file_name,
+                    mime=mime,
+                )
+            elif export_job is not None:
+                st.info(f"Preparing {label}...")
+                poll_jobs = True
+            elif st.button(f"Prepare {label}", key=f"prepare_{export_format}"):
+                st.session_state[job_key] = submit_export(export_format, audit_id, audit_data)
+                st.rerun()
+
+    return poll_jobs
+
+
+def _render_report(report):
+    if len(report) <= 1:
+        st.markdown("<div class='card'>", unsafe_allow_html=True)
+        for section in report.sections:
+            st.markdown(section.body, unsafe_allow_html=True)
+        st.markdown("</div>", unsafe_allow_html=True)
+        return
+
+    # Search jumps straight to a section through the prebuilt word index
+    query = st.text_input("Search the report", placeholder="e.g., KYC")
+    if query:
+        hits = report.search(query)
+        if not hits:
+            st.caption("No sections match.")
+        for hit in hits:
+            st.button(report.toc[hit].strip(), key=f"report_hit_{hit}", on_click=_jump_to, args=(report.toc[hit],))
+
+    # A section picked in another report starts over at the top
+    if report.position(st.session_state.get('report_section')) is None:
+        st.session_state.pop('report_section', None)
+    current = report.position(st.selectbox("Contents", report.toc, key='report_section'))
+
+    # Only a window of sections from the selected one is laid out, and only opened ones are rendered
+    st.markdown("<div class='card'>", unsafe_allow_html=True)
+    for number in range(current, min(current + SECTIONS_PER_PAGE, len(report))):
+        section = report.sections[number]
+        if st.toggle(section.title, value=number == current, key=f"report_open_{number}"):
+            st.markdown(section.body, unsafe_allow_html=True)
+    st.markdown("</div>", unsafe_allow_html=True)
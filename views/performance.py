@@ -0,0 +1,26 @@
+import pandas as pd
+import streamlit as st
+
+import perf
+
+
+# Sidebar panel listing where recent reruns spent their time, with Prometheus and JSON exports
+def render_panel():
+    with st.sidebar:
+        st.markdown("### Performance")
+        rows = perf.summary()
+        if not rows:
+            st.caption("No spans recorded yet. Interact with the dashboard to collect timings.")
+            return
+
+        summary = pd.DataFrame(rows).set_index("span")
+        summary[["total", "mean", "p50", "p95", "max"]] *= 1000
+        st.dataframe(summary.round(2), use_container_width=True)
+        st.caption(f"Times in ms over the last {len(perf.spans())} spans")
+
+        col1, col2 = st.columns(2)
+        col1.download_button("Prometheus", perf.to_prometheus(), file_name="complysmart_metrics.txt", mime="text/plain")
+        col2.download_button("JSON", perf.to_json(), file_name="complysmart_spans.json", mime="application/json")
+        if st.button("Clear timings"):
+            perf.clear()
+            st.rerun()
@@ -0,0 +1,51 @@
+import streamlit as st
+
+
+def render():
+    st.markdown("<div class='main-header'>Portfolio Compliance</div>", unsafe_allow_html=True)
+
+    uploaded = st.file_uploader("Upload audit results (JSON array or JSON lines)", type=["json", "jsonl"])
+
+    if uploaded is None:
+        st.info("Upload the audit results for your branches and subsidiaries to compare compliance across the portfolio. Each record needs an 'entity' name and the audit's 'score' text.")
+    else:
+        # pandas and plotly come in with these, so an empty portfolio page loads neither
+        from charts import distribution_chart_spec, heatmap_chart_spec, regulator_chart_spec, show_chart
+        from portfolio import WORST_ENTITIES, load_portfolio
+
+        # Everything below reads precomputed aggregates, however many entities were uploaded
+        portfolio = load_portfolio(uploaded.getvalue())
+
+        kpi_col1, kpi_col2, kpi_col3, kpi_col4 = st.columns(4)
+        kpi_col1.metric("Entities", f"{portfolio['entities']:,}")
+        kpi_col2.metric("Average Score", f"{portfolio['average_score']:.1f}")
+        kpi_col3.metric("Entities Below 50", f"{portfolio['below_50']:,}")
+        kpi_col4.metric("Metrics", f"{portfolio['metrics']:,}")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            show_chart(distribution_chart_spec(*portfolio['distribution'], "Entity Score Distribution"))
+        with col2:
+            show_chart(regulator_chart_spec(portfolio['by_regulator'].to_dict()))
+
+        show_chart(heatmap_chart_spec(*portfolio['heatmap'], "Average Compliance by Regulator and Category"))
+
+        st.markdown("<div class='sub-header'>Lowest Scoring Entities</div>", unsafe_allow_html=True)
+        st.dataframe(portfolio['by_entity'].head(WORST_ENTITIES), use_container_width=True)
+
+        # Drill-down
+        st.markdown("<div class='sub-header'>Drill-down</div>", unsafe_allow_html=True)
+        drill_col1, drill_col2 = st.columns(2)
+
+        with drill_col1:
+            regulator = st.selectbox("Regulatory Body", portfolio['by_regulator'].index)
+            st.markdown(f"Lowest scoring entities for {regulator}")
+            st.dataframe(portfolio['by_entity_regulator'].loc[[regulator]].head(WORST_ENTITIES), use_container_width=True, hide_index=True)
+
+        with drill_col2:
+            entity = st.selectbox("Entity", portfolio['by_entity'].index)
+            st.markdown(f"Metrics for {entity}")
+            if entity in portfolio['entity_metrics'].index:
+                st.dataframe(portfolio['entity_metrics'].loc[[entity]], use_container_width=True, hide_index=True)
+            else:
+                st.caption("No metrics could be parsed from this entity's audits.")
@@ -0,0 +1,138 @@
+import time
+
+import requests
+import streamlit as st
+
+import answer_cache
+import api_client
+from answer_cache import SUGGESTED_QUESTIONS, normalize_question
+from exporters import export_answers
+
+# Minimum seconds between placeholder updates while an answer streams in
+STREAM_RENDER_INTERVAL = 0.05
+# Questions accepted in one batch
+MAX_BATCH_QUESTIONS = 100
+QA_MODES = ["Single question", "Batch"]
+
+
+def render():
+    st.markdown("<div class='main-header'>Compliance Q&A</div>", unsafe_allow_html=True)
+
+    st.markdown("""
+    <div class='qa-card'>
+    <p>Ask any questions about your compliance status, regulatory requirements, or recommendations for improvement.</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Batch mode asks for poll reruns while its answers are still coming in
+    if st.radio("Mode", QA_MODES, horizontal=True, key="qa_mode", label_visibility="collapsed") == "Batch":
+        return _render_batch()
+    _render_single()
+
+
+def _render_single():
+    # Initialize session state for user question if not exists
+    if 'user_question' not in st.session_state:
+        st.session_state['user_question'] = ""
+
+    # User input
+    user_question = st.text_input("Enter your question:", value=st.session_state['user_question'], placeholder="e.g., What are our biggest compliance risks?")
+
+    # Suggested questions
+    st.markdown("### Suggested Questions")
+
+    question_cols = st.columns(2)
+
+    for i, question in enumerate(SUGGESTED_QUESTIONS):
+        col = question_cols[i % 2]
+        if col.button(question, key=f"q_{i}"):
+            st.session_state['user_question'] = question
+            st.rerun()
+
+    # Process the question (either from input or suggestion)
+    if user_question:
+        audit_id = st.session_state.get('audit_id')
+        try:
+            # Serve cached answers, otherwise stream one from the backend. A question that is already
+            # being fetched (pre-warmed, or asked by another session) follows that request's stream.
+            answer = answer_cache.lookup(user_question, audit_id)
+            chunks = iter(())
+            if answer is None:
+                chunks = answer_cache.stream(user_question, audit_id)
+                with st.spinner("Generating answer..."):
+                    answer = next(chunks, "")
+
+            # Display the answer, re-rendering the placeholder as chunks arrive
+            st.markdown("<div class='card'>", unsafe_allow_html=True)
+            st.markdown("### Answer")
+            answer_placeholder = st.empty()
+            last_render = 0.0
+            for chunk in chunks:
+                answer += chunk
+                if time.monotonic() - last_render >= STREAM_RENDER_INTERVAL:
+                    answer_placeholder.markdown(answer + "▌")
+                    last_render = time.monotonic()
+            answer_placeholder.markdown(answer)
+            st.markdown("</div>", unsafe_allow_html=True)
+
+            # Clear the question after processing
+            st.session_state['user_question'] = ""
+        except Exception as e:
+            st.error(_error_message(e))
+
+
+def _error_message(error):
+    if isinstance(error, requests.HTTPError):
+        return f"Error: {error.response.status_code}"
+    if isinstance(error, api_client.BackendUnavailable):
+        return str(error)
+    return f"Error connecting to API: {str(error)}"
+
+
+def _render_batch():
+    # One question per line; the suggested questions are the starting point
+    questions_text = st.text_area(
+        "Questions (one per line):", value="\n".join(SUGGESTED_QUESTIONS), height=200, key="qa_batch_text"
+    )
+    if st.button("Ask All", type="primary"):
+        questions, seen = [], set()
+        for line in questions_text.splitlines():
+            question = line.strip()
+            if question and normalize_question(question) not in seen:
+                seen.add(normalize_question(question))
+                questions.append(question)
+        if len(questions) > MAX_BATCH_QUESTIONS:
+            st.warning(f"Only the first {MAX_BATCH_QUESTIONS} questions are asked.")
+        # Every question is submitted once, here, to the bounded answer pool (cached answers complete
+        # immediately). The futures hold the answers and errors, so reruns only read them.
+        audit_id = st.session_state.get('audit_id')
+        st.session_state['qa_batch'] = [
+            (question, answer_cache.submit(question, audit_id)) for question in questions[:MAX_BATCH_QUESTIONS]
+        ]
+
+    batch = st.session_state.get('qa_batch')
+    if not batch:
+        return False
+
+    # Each answer is filled in as soon as it arrives, in whatever order; the page polls until all are in
+    finished = sum(future.done() for _, future in batch)
+    st.progress(finished / len(batch), text=f"{finished} of {len(batch)} answered")
+    answered = []
+    for number, (question, future) in enumerate(batch, start=1):
+        st.markdown(f"### {number}. {question}")
+        if not future.done():
+            st.caption("Waiting for answer...")
+        elif future.exception() is not None:
+            st.error(_error_message(future.exception()))
+        else:
+            st.markdown(future.result())
+            answered.append((question, future.result()))
+
+    if finished == len(batch) and answered:
+        st.download_button(
+            label="Download Answers",
+            data=export_answers(answered),
+            file_name="compliance_qa.md",
+            mime="text/markdown",
+        )
+    return finished < len(batch)